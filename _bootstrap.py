@@ -0,0 +1,15 @@
+"""
+Import path setup shared by the top-level scripts.
+
+Importing this module makes the modules under ``src/`` (``config``,
+``analysis``, ``etl``) importable, so each runner script does not need its
+own ``sys.path`` manipulation. It is a no-op if ``src`` is already on the path.
+"""
+
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'src')
+
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
@@ -6,14 +6,17 @@ This script will manually load and normalize DEMO and REAC data to understand
 why there's 0% key overlap between the tables.
 """
 
-import sys
+import os
 from pathlib import Path
+import numpy as np
 import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from pyarrow import csv as pacsv
 import logging
 from typing import Dict, List
 
-# Add src to path for imports
-sys.path.append(str(Path(__file__).parent / 'src'))
+import _bootstrap  # noqa: F401  (adds src/ to the import path)
 
 from config import COLUMN_MAPPINGS, FAERS_CONFIG
 
@@ -27,97 +30,137 @@ def _normalize_column(df: pd.DataFrame, target_col: str, source_cols: List[str])
     """
     for col in source_cols:
         if col in df.columns:
-            logger.info(f"Found column '{col}' for {target_col}")
-            series = df[col].astype(str).str.strip()
-            logger.info(f"Sample values: {series.head(3).tolist()}")
+            logger.info("Found column '%s' for %s", col, target_col)
+            # Trim whitespace with Arrow's string kernel instead of object-dtype .str.strip()
+            trimmed = pc.utf8_trim_whitespace(pa.array(df[col], type=pa.string(), from_pandas=True))
+            series = pd.Series(trimmed, index=df.index, dtype=pd.ArrowDtype(pa.string()))
+            if logger.isEnabledFor(logging.INFO):
+                logger.info("Sample values: %s", series.head(3).tolist())
             return series
     
     # Return empty series if no matching column found
-    logger.warning(f"No source column found for {target_col} in {source_cols}")
+    logger.warning("No source column found for %s in %s", target_col, source_cols)
     return pd.Series(index=df.index, dtype=str)
 
+def _read_key_columns(path: Path, candidates: List[str], max_rows: int) -> pd.DataFrame:
+    """
+    Read up to ``max_rows`` rows of the candidate key columns with Arrow's CSV reader.
+    
+    Rows are handled like the pandas reader this replaced, so the key counts
+    stay comparable: empty fields are nulls, and rows with too few or too many
+    fields are kept (padded with nulls or truncated) in their file position.
+    """
+    with open(path, encoding='utf-8', errors='replace') as f:
+        header_line = f.readline().rstrip('\r\n')
+    columns = [col for col in header_line.split('$') if col in candidates]
+    
+    # An empty include_columns would make Arrow read every column
+    if not columns:
+        logger.warning("None of the key columns %s found in %s", candidates, path.name)
+        return pd.DataFrame()
+    
+    # Arrow rejects rows with the wrong field count; repair and re-parse them
+    repaired_lines = []
+    repaired_numbers = []
+    
+    def handle_invalid_row(row):
+        fields = row.text.split('$')[:row.expected_columns]
+        fields += [''] * (row.expected_columns - len(fields))
+        repaired_lines.append('$'.join(fields))
+        repaired_numbers.append(row.number)
+        return 'skip'
+    
+    convert_options = pacsv.ConvertOptions(
+        include_columns=columns,
+        column_types={col: pa.string() for col in columns},
+        strings_can_be_null=True
+    )
+    reader = pacsv.open_csv(
+        path,
+        parse_options=pacsv.ParseOptions(delimiter='$', invalid_row_handler=handle_invalid_row),
+        convert_options=convert_options
+    )
+    
+    # Stream record batches and stop once enough rows have been read
+    batches = []
+    n_rows = 0
+    for batch in reader:
+        batches.append(batch)
+        n_rows += batch.num_rows
+        if n_rows + len(repaired_lines) >= max_rows:
+            break
+    
+    table = pa.Table.from_batches(batches, schema=reader.schema)
+    if repaired_lines:
+        logger.info("Repaired %s rows with a wrong field count in %s",
+                    format(len(repaired_lines), ","), path.name)
+        repaired = pacsv.read_csv(
+            pa.py_buffer('\n'.join([header_line] + repaired_lines).encode('utf-8')),
+            parse_options=pacsv.ParseOptions(delimiter='$'),
+            convert_options=convert_options
+        )
+        
+        # Put the repaired rows back at their data row index (line number
+        # minus the header), with the regular rows filling the gaps in order
+        repaired_idx = np.asarray(repaired_numbers, dtype=np.int64) - 2
+        slots = np.arange(n_rows + len(repaired_idx))
+        regular_idx = slots[~np.isin(slots, repaired_idx)][:n_rows]
+        order = np.argsort(np.concatenate([regular_idx, repaired_idx]), kind='stable')
+        table = pa.concat_tables([table, repaired]).take(order)
+    
+    return table.slice(0, max_rows).to_pandas()
+
 def debug_single_quarter(quarter_path: Path):
     """Debug a single quarter's data loading and normalization."""
     
-    logger.info(f"=== Debugging {quarter_path.name} ===")
+    logger.info("=== Debugging %s ===", quarter_path.name)
     
     # Find ascii directory (could be ASCII or ascii)
-    ascii_dir = None
-    for subdir in quarter_path.iterdir():
-        if subdir.is_dir() and subdir.name.lower() == 'ascii':
-            ascii_dir = subdir
-            break
+    with os.scandir(quarter_path) as entries:
+        ascii_dir = next(
+            (Path(e.path) for e in entries if e.is_dir() and e.name.lower() == 'ascii'),
+            None
+        )
     
     if not ascii_dir:
-        logger.error(f"No ASCII directory found in {quarter_path}")
+        logger.error("No ASCII directory found in %s", quarter_path)
         return
     
-    # Load DEMO and REAC files
+    # Find DEMO and REAC files in a single directory pass
     demo_file = None
     reac_file = None
     
-    for file in ascii_dir.iterdir():
-        if file.name.startswith('DEMO') and file.name.endswith('.txt'):
-            demo_file = file
-        elif file.name.startswith('REAC') and file.name.endswith('.txt'):
-            reac_file = file
+    with os.scandir(ascii_dir) as entries:
+        for entry in entries:
+            name = entry.name
+            if not name.endswith('.txt'):
+                continue
+            if name.startswith('DEMO'):
+                demo_file = Path(entry.path)
+            elif name.startswith('REAC'):
+                reac_file = Path(entry.path)
+            if demo_file and reac_file:
+                break
     
     if not demo_file or not reac_file:
-        logger.error(f"Missing DEMO or REAC files in {ascii_dir}")
+        logger.error("Missing DEMO or REAC files in %s", ascii_dir)
         return
     
-    logger.info(f"Loading DEMO: {demo_file.name}")
-    logger.info(f"Loading REAC: {reac_file.name}")
-    
-    # Load raw data with chunked reading
-    demo_chunks = []
-    reac_chunks = []
+    logger.info("Loading DEMO: %s", demo_file.name)
+    logger.info("Loading REAC: %s", reac_file.name)
     
+    # Load only the join key columns
     try:
-        # Load DEMO in chunks
-        chunk_iter = pd.read_csv(
-            demo_file, 
-            sep='$', 
-            chunksize=50000,
-            encoding='utf-8',
-            on_bad_lines='skip',
-            dtype=str
-        )
-        
-        for i, chunk in enumerate(chunk_iter):
-            if i == 0:  # First chunk
-                logger.info(f"DEMO columns: {list(chunk.columns)}")
-                logger.info(f"DEMO first row sample: {chunk.iloc[0].to_dict()}")
-            demo_chunks.append(chunk)
-            if i >= 2:  # Limit to first 3 chunks for debugging
-                break
-        
-        demo_df = pd.concat(demo_chunks, ignore_index=True)
-        logger.info(f"DEMO loaded: {len(demo_df):,} rows")
-        
-        # Load REAC in chunks
-        chunk_iter = pd.read_csv(
-            reac_file, 
-            sep='$', 
-            chunksize=50000,
-            encoding='utf-8',
-            on_bad_lines='skip',
-            dtype=str
-        )
-        
-        for i, chunk in enumerate(chunk_iter):
-            if i == 0:  # First chunk
-                logger.info(f"REAC columns: {list(chunk.columns)}")
-                logger.info(f"REAC first row sample: {chunk.iloc[0].to_dict()}")
-            reac_chunks.append(chunk)
-            if i >= 2:  # Limit to first 3 chunks for debugging
-                break
+        demo_df = _read_key_columns(demo_file, COLUMN_MAPPINGS['case_id'], max_rows=150000)
+        logger.info("DEMO key columns: %s", list(demo_df.columns))
+        logger.info("DEMO loaded: %s rows", format(len(demo_df), ","))
         
-        reac_df = pd.concat(reac_chunks, ignore_index=True)
-        logger.info(f"REAC loaded: {len(reac_df):,} rows")
+        reac_df = _read_key_columns(reac_file, COLUMN_MAPPINGS['case_id'], max_rows=150000)
+        logger.info("REAC key columns: %s", list(reac_df.columns))
+        logger.info("REAC loaded: %s rows", format(len(reac_df), ","))
         
     except Exception as e:
-        logger.error(f"Error loading files: {e}")
+        logger.error("Error loading files: %s", e)
         return
     
     # Normalize case_id columns
@@ -129,25 +172,27 @@ def debug_single_quarter(quarter_path: Path):
     # Analyze overlap
     logger.info("\n=== Analyzing key overlap ===")
     
-    demo_keys = set(demo_case_id.dropna().unique())
-    reac_keys = set(reac_case_id.dropna().unique())
+    demo_keys = pc.unique(pa.array(demo_case_id.dropna(), type=pa.string()))
+    reac_keys = pc.unique(pa.array(reac_case_id.dropna(), type=pa.string()))
     
-    overlap_keys = demo_keys.intersection(reac_keys)
+    overlap_keys = pc.filter(demo_keys, pc.is_in(demo_keys, value_set=reac_keys))
     
-    logger.info(f"DEMO unique keys: {len(demo_keys):,}")
-    logger.info(f"REAC unique keys: {len(reac_keys):,}")
-    logger.info(f"Overlapping keys: {len(overlap_keys):,}")
+    logger.info("DEMO unique keys: %s", format(len(demo_keys), ","))
+    logger.info("REAC unique keys: %s", format(len(reac_keys), ","))
+    logger.info("Overlapping keys: %s", format(len(overlap_keys), ","))
     
     if len(demo_keys) > 0:
         overlap_percent = (len(overlap_keys) / len(demo_keys)) * 100
-        logger.info(f"Overlap percentage: {overlap_percent:.1f}%")
+        logger.info("Overlap percentage: %.1f%%", overlap_percent)
     
     # Sample keys for comparison
-    logger.info(f"Sample DEMO keys: {list(demo_keys)[:5]}")
-    logger.info(f"Sample REAC keys: {list(reac_keys)[:5]}")
+    if logger.isEnabledFor(logging.INFO):
+        logger.info("Sample DEMO keys: %s", demo_keys[:5].to_pylist())
+        logger.info("Sample REAC keys: %s", reac_keys[:5].to_pylist())
     
     if len(overlap_keys) > 0:
-        logger.info(f"Sample overlapping keys: {list(overlap_keys)[:5]}")
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Sample overlapping keys: %s", overlap_keys[:5].to_pylist())
     else:
         logger.warning("No overlapping keys found!")
         
@@ -158,8 +203,8 @@ def debug_single_quarter(quarter_path: Path):
         demo_sample = demo_case_id.dropna().head(10)
         reac_sample = reac_case_id.dropna().head(10)
         
-        logger.info(f"DEMO sample case_ids: {demo_sample.tolist()}")
-        logger.info(f"REAC sample case_ids: {reac_sample.tolist()}")
+        logger.info("DEMO sample case_ids: %s", demo_sample.tolist())
+        logger.info("REAC sample case_ids: %s", reac_sample.tolist())
         
         # Check if any DEMO keys are close to REAC keys
         demo_sample_set = set(demo_sample)
@@ -169,9 +214,9 @@ def debug_single_quarter(quarter_path: Path):
         for demo_key in list(demo_sample_set)[:5]:
             for reac_key in list(reac_sample_set)[:5]:
                 if demo_key == reac_key:
-                    logger.info(f"MATCH: {demo_key} == {reac_key}")
+                    logger.info("MATCH: %s == %s", demo_key, reac_key)
                 elif str(demo_key).strip() == str(reac_key).strip():
-                    logger.info(f"MATCH after strip: '{demo_key}' == '{reac_key}'")
+                    logger.info("MATCH after strip: '%s' == '%s'", demo_key, reac_key)
 
 def main():
     """Main debugging function."""
@@ -189,7 +234,7 @@ def main():
         if quarter_dir.exists():
             debug_single_quarter(quarter_dir)
         else:
-            logger.warning(f"Quarter directory not found: {quarter_dir}")
+            logger.warning("Quarter directory not found: %s", quarter_dir)
 
 if __name__ == "__main__":
     main()
@@ -6,13 +6,11 @@ This script demonstrates the anomaly detection capabilities of the AE Trend Anal
 It shows how to use the different detection methods and interpret results.
 """
 
-import sys
 from pathlib import Path
 import pandas as pd
 import numpy as np
 
-# Add src to path for imports
-sys.path.append(str(Path(__file__).parent / "src"))
+import _bootstrap  # noqa: F401  (adds src/ to the import path)
 
 from analysis.anomaly import (
     rolling_zscore, 
@@ -34,18 +32,15 @@ def create_demo_data():
     # Generate 3 years of monthly data
     dates = pd.date_range('2021-01-01', periods=36, freq='MS')
     
-    # Base trend: growing from 100 to 300 events per month
-    trend = np.linspace(100, 300, len(dates))
+    n = len(dates)
+    month_idx = np.arange(n)
+    rng = np.random.default_rng(42)  # For reproducible results
     
-    # Seasonal pattern: higher in winter months
-    seasonal = 30 * np.sin(2 * np.pi * (np.arange(len(dates)) + 3) / 12)
-    
-    # Random noise
-    np.random.seed(42)  # For reproducible results
-    noise = np.random.normal(0, 10, len(dates))
-    
-    # Combine components
-    values = trend + seasonal + noise
+    # Combine components in one pass: base trend growing from 100 to 300
+    # events per month, seasonal pattern higher in winter months, random noise
+    values = (100 + 200 * month_idx / (n - 1)
+              + 30 * np.sin(2 * np.pi * (month_idx + 3) / 12)
+              + rng.normal(0, 10, n))
     
     # Inject known spikes at specific months
     spike_months = [8, 15, 28]  # Sept 2021, April 2022, May 2023
@@ -55,8 +50,7 @@ def create_demo_data():
         "May 2023: Regulatory investigation"
     ]
     
-    for month_idx in spike_months:
-        values[month_idx] += np.random.uniform(80, 120)  # Add significant spike
+    values[spike_months] += rng.uniform(80, 120, len(spike_months))  # Add significant spikes
     
     # Create series
     series = pd.Series(values.astype(int), index=dates, name='adverse_events')
@@ -113,9 +107,10 @@ def demo_stl_decomposition(series):
             # Show top 3 spikes
             top_spikes = spikes.nlargest(3, 'z')
             print(f"\n🏆 Top 3 spikes:")
-            for i, (date, row) in enumerate(top_spikes.iterrows(), 1):
+            for i, (date, value, z) in enumerate(
+                    zip(top_spikes.index, top_spikes['value'].to_numpy(), top_spikes['z'].to_numpy()), 1):
                 print(f"   {i}. {date.strftime('%Y-%m')}: "
-                      f"value={row['value']:,}, z-score={row['z']:.2f}")
+                      f"value={value:,}, z-score={z:.2f}")
         
     except ImportError:
         print("❌ STL method requires statsmodels library")
@@ -4,22 +4,23 @@ Simple runner script for the Streamlit dashboard with sample mode support.
 Usage: python run_dashboard.py [--sample]
 """
 
+import os
 import sys
 import subprocess
 from pathlib import Path
 
+import _bootstrap
+
 def main():
     """Run the Streamlit dashboard."""
-    # Add src directory to Python path
-    src_dir = Path(__file__).parent / "src"
-    sys.path.insert(0, str(src_dir))
+    src_dir = Path(_bootstrap.SRC_DIR)
     
     # Check for sample mode
     sample_mode = "--sample" in sys.argv
     
     # Build streamlit command
     cmd = [
-        sys.executable, "-m", "streamlit", "run", 
+        sys.executable, "-m", "streamlit", "run",
         str(src_dir / "app" / "streamlit_mvp.py")
     ]
     
@@ -27,8 +28,8 @@ def main():
         cmd.append("--")
         cmd.append("--sample")
     
-    # Set environment variable for sample mode
-    env = {}
+    # Inherit the caller's environment (PATH, HOME, virtualenv) and add sample mode
+    env = os.environ.copy()
     if sample_mode:
         env["AE_SAMPLE"] = "1"
     
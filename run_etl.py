@@ -5,11 +5,8 @@ This script handles the import path setup and runs the main ETL process.
 """
 
 import sys
-from pathlib import Path
 
-# Add src directory to Python path
-src_dir = Path(__file__).parent / "src"
-sys.path.insert(0, str(src_dir))
+import _bootstrap  # noqa: F401  (adds src/ to the import path)
 
 def main():
     """Run the ETL pipeline."""
@@ -4,12 +4,7 @@ Example script showing how to run the AE Trend Analyzer pipeline.
 This script demonstrates both individual module usage and the complete pipeline.
 """
 
-import sys
-from pathlib import Path
-
-# Add src to path for imports
-src_path = Path(__file__).parent / 'src'
-sys.path.insert(0, str(src_path))
+import _bootstrap  # noqa: F401  (adds src/ to the import path)
 
 def run_complete_pipeline():
     """Run the complete ETL pipeline."""
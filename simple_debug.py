@@ -3,9 +3,82 @@
 Simple debug script to check FAERS join keys.
 """
 
-import pandas as pd
+import numpy as np
+import pyarrow as pa
+from pyarrow import csv as pacsv
 from pathlib import Path
 
+# Only the join keys are inspected, so skip parsing every other column
+KEY_COLUMNS = ['primaryid', 'caseid']
+
+def read_keys(path, nrows):
+    """
+    Read the first ``nrows`` rows of the key columns with Arrow's CSV reader.
+    
+    Like the pandas reader this replaced, empty fields are nulls and rows with
+    too few or too many fields are kept (padded or truncated) in file order.
+    """
+    with open(path, encoding='utf-8', errors='replace') as f:
+        header_line = f.readline().rstrip('\r\n')
+    
+    # Arrow rejects rows with the wrong field count; repair and re-parse them
+    repaired_lines = []
+    repaired_numbers = []
+    
+    def handle_invalid_row(row):
+        fields = row.text.split('$')[:row.expected_columns]
+        fields += [''] * (row.expected_columns - len(fields))
+        repaired_lines.append('$'.join(fields))
+        repaired_numbers.append(row.number)
+        return 'skip'
+    
+    convert_options = pacsv.ConvertOptions(
+        include_columns=KEY_COLUMNS,
+        column_types={col: pa.string() for col in KEY_COLUMNS},
+        strings_can_be_null=True
+    )
+    reader = pacsv.open_csv(
+        path,
+        parse_options=pacsv.ParseOptions(delimiter='$', invalid_row_handler=handle_invalid_row),
+        convert_options=convert_options
+    )
+    batches = []
+    n_rows = 0
+    for batch in reader:
+        batches.append(batch)
+        n_rows += batch.num_rows
+        if n_rows + len(repaired_lines) >= nrows:
+            break
+    
+    table = pa.Table.from_batches(batches, schema=reader.schema)
+    if repaired_lines:
+        repaired = pacsv.read_csv(
+            pa.py_buffer('\n'.join([header_line] + repaired_lines).encode('utf-8')),
+            parse_options=pacsv.ParseOptions(delimiter='$'),
+            convert_options=convert_options
+        )
+        # Repaired rows go back to their data row index (line number minus the header)
+        repaired_idx = np.asarray(repaired_numbers, dtype=np.int64) - 2
+        slots = np.arange(n_rows + len(repaired_idx))
+        regular_idx = slots[~np.isin(slots, repaired_idx)][:n_rows]
+        order = np.argsort(np.concatenate([regular_idx, repaired_idx]), kind='stable')
+        table = pa.concat_tables([table, repaired]).take(order)
+    return table.slice(0, nrows)
+
+def encode_keys(demo_col, reac_col):
+    """
+    Dictionary-encode DEMO and REAC keys together in one hash pass.
+    
+    Returns the shared dictionary plus the sorted unique codes present on each side.
+    """
+    demo_col = demo_col.drop_null()
+    reac_col = reac_col.drop_null()
+    combined = pa.chunked_array(demo_col.chunks + reac_col.chunks, type=pa.string())
+    encoded = combined.combine_chunks().dictionary_encode()
+    codes = encoded.indices.to_numpy()
+    n_demo = len(demo_col)
+    return encoded.dictionary, np.unique(codes[:n_demo]), np.unique(codes[n_demo:])
+
 def main():
     print("=== FAERS Join Key Debug ===")
     
@@ -14,20 +87,20 @@ def main():
     reac_path = Path("data/raw/faers_ascii_2013q1/ascii/REAC13Q1.txt")
     
     print("Loading DEMO sample...")
-    demo_df = pd.read_csv(demo_path, sep='$', nrows=1000, dtype=str, on_bad_lines='skip')
-    print(f"DEMO columns: {list(demo_df.columns)}")
-    print(f"DEMO rows: {len(demo_df)}")
+    demo_tbl = read_keys(demo_path, nrows=1000)
+    print(f"DEMO columns: {demo_tbl.column_names}")
+    print(f"DEMO rows: {demo_tbl.num_rows}")
     
     print("\nLoading REAC sample...")
-    reac_df = pd.read_csv(reac_path, sep='$', nrows=1000, dtype=str, on_bad_lines='skip')
-    print(f"REAC columns: {list(reac_df.columns)}")
-    print(f"REAC rows: {len(reac_df)}")
+    reac_tbl = read_keys(reac_path, nrows=1000)
+    print(f"REAC columns: {reac_tbl.column_names}")
+    print(f"REAC rows: {reac_tbl.num_rows}")
     
-    # Extract key columns
-    demo_primaryid = demo_df['primaryid'].dropna().unique()
-    demo_caseid = demo_df['caseid'].dropna().unique()
-    reac_primaryid = reac_df['primaryid'].dropna().unique()
-    reac_caseid = reac_df['caseid'].dropna().unique()
+    # Encode each key once across both tables; overlaps become int code merges
+    primaryid_dict, demo_primaryid, reac_primaryid = encode_keys(
+        demo_tbl.column('primaryid'), reac_tbl.column('primaryid'))
+    caseid_dict, demo_caseid, reac_caseid = encode_keys(
+        demo_tbl.column('caseid'), reac_tbl.column('caseid'))
     
     print(f"\nDEMO primaryid unique values: {len(demo_primaryid)}")
     print(f"DEMO caseid unique values: {len(demo_caseid)}")
@@ -35,31 +108,27 @@ def main():
     print(f"REAC caseid unique values: {len(reac_caseid)}")
     
     # Check overlap using primaryid
-    demo_primaryid_set = set(demo_primaryid)
-    reac_primaryid_set = set(reac_primaryid)
-    primaryid_overlap = demo_primaryid_set.intersection(reac_primaryid_set)
+    primaryid_overlap = np.intersect1d(demo_primaryid, reac_primaryid, assume_unique=True)
     
-    print(f"\nPrimaryID overlap: {len(primaryid_overlap)} out of {len(demo_primaryid_set)}")
-    print(f"Overlap percentage: {len(primaryid_overlap)/len(demo_primaryid_set)*100:.1f}%")
+    print(f"\nPrimaryID overlap: {len(primaryid_overlap)} out of {len(demo_primaryid)}")
+    print(f"Overlap percentage: {len(primaryid_overlap)/len(demo_primaryid)*100:.1f}%")
     
     # Check overlap using caseid
-    demo_caseid_set = set(demo_caseid)
-    reac_caseid_set = set(reac_caseid)
-    caseid_overlap = demo_caseid_set.intersection(reac_caseid_set)
+    caseid_overlap = np.intersect1d(demo_caseid, reac_caseid, assume_unique=True)
     
-    print(f"\nCaseID overlap: {len(caseid_overlap)} out of {len(demo_caseid_set)}")
-    print(f"Overlap percentage: {len(caseid_overlap)/len(demo_caseid_set)*100:.1f}%")
+    print(f"\nCaseID overlap: {len(caseid_overlap)} out of {len(demo_caseid)}")
+    print(f"Overlap percentage: {len(caseid_overlap)/len(demo_caseid)*100:.1f}%")
     
     # Sample values
-    print(f"\nSample DEMO primaryid: {list(demo_primaryid)[:5]}")
-    print(f"Sample REAC primaryid: {list(reac_primaryid)[:5]}")
-    print(f"Sample DEMO caseid: {list(demo_caseid)[:5]}")
-    print(f"Sample REAC caseid: {list(reac_caseid)[:5]}")
+    print(f"\nSample DEMO primaryid: {primaryid_dict.take(demo_primaryid[:5]).to_pylist()}")
+    print(f"Sample REAC primaryid: {primaryid_dict.take(reac_primaryid[:5]).to_pylist()}")
+    print(f"Sample DEMO caseid: {caseid_dict.take(demo_caseid[:5]).to_pylist()}")
+    print(f"Sample REAC caseid: {caseid_dict.take(reac_caseid[:5]).to_pylist()}")
     
     if len(primaryid_overlap) > 0:
-        print(f"\nSample overlapping primaryids: {list(primaryid_overlap)[:5]}")
+        print(f"\nSample overlapping primaryids: {primaryid_dict.take(primaryid_overlap[:5]).to_pylist()}")
     if len(caseid_overlap) > 0:
-        print(f"Sample overlapping caseids: {list(caseid_overlap)[:5]}")
+        print(f"Sample overlapping caseids: {caseid_dict.take(caseid_overlap[:5]).to_pylist()}")
 
 if __name__ == "__main__":
     main()
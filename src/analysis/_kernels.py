@@ -0,0 +1,134 @@
+"""
+Optional Numba Kernels
+
+Compiled inner loops used by the analysis modules when Numba is installed.
+Numba is an optional dependency: every getter here returns None when it is
+missing and callers fall back to their pandas/NumPy implementation.
+"""
+
+import math
+from functools import lru_cache
+
+import numpy as np
+
+# Upper bound on per-thread partial count matrices in the parallel kernel
+PARALLEL_MAX_THREADS = 4
+
+
+@lru_cache(maxsize=None)
+def get_count_kernel(code_dtype: str = 'int32', parallel: bool = False):
+    """
+    Build the dense (month, code) count kernel for a given code dtype.
+
+    The kernel is compiled eagerly for an explicit signature and memoized per
+    dtype, so repeated aggregations never re-JIT; ``cache=True`` also keeps the
+    machine code on disk between runs.
+
+    Args:
+        code_dtype: NumPy dtype name of the categorical codes (int8/int16/int32/...)
+        parallel: Build the multi-threaded variant, which splits rows across up to
+            PARALLEL_MAX_THREADS threads (GIL released) with private partial
+            matrices summed at the end. Only worth it for millions of rows.
+
+    Returns:
+        Compiled ``kernel(ym_idx, code_idx, out)`` that increments
+        ``out[ym_idx[i], code_idx[i]]`` for every row, or None if Numba
+        is not installed
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    # Inputs are declared read-only so views of pandas buffers are accepted as-is
+    ym_type = numba.types.Array(numba.int64, 1, 'A', readonly=True)
+    code_type = numba.types.Array(numba.from_dtype(np.dtype(code_dtype)), 1, 'A', readonly=True)
+    signature = numba.void(ym_type, code_type, numba.int64[:, :])
+
+    if not parallel:
+        @numba.njit(signature, cache=True)
+        def count2d(ym_idx, code_idx, out):
+            for i in range(ym_idx.shape[0]):
+                out[ym_idx[i], code_idx[i]] += 1
+
+        return count2d
+
+    n_chunks = PARALLEL_MAX_THREADS
+
+    @numba.njit(signature, parallel=True, nogil=True, cache=True)
+    def count2d_parallel(ym_idx, code_idx, out):
+        n = ym_idx.shape[0]
+        step = (n + n_chunks - 1) // n_chunks
+        partial = np.zeros((n_chunks, out.shape[0], out.shape[1]), dtype=np.int64)
+        for chunk in numba.prange(n_chunks):
+            for i in range(chunk * step, min(n, (chunk + 1) * step)):
+                partial[chunk, ym_idx[i], code_idx[i]] += 1
+        for chunk in range(n_chunks):
+            out += partial[chunk]
+
+    return count2d_parallel
+
+
+@lru_cache(maxsize=None)
+def get_rolling_z_kernel():
+    """
+    Build the trailing rolling Z-score kernel used by ``rolling_zscore``.
+
+    One loop over the series computes each window's mean, sample std, Z-score
+    and spike flag, so the per-entity calls made by the insights summaries skip
+    pandas dispatch entirely. Semantics follow ``min_periods=1``: NaNs are
+    skipped, windows with fewer than 2 values have a NaN std, and a zero or
+    undefined std gives a Z-score of 0.
+
+    Returns:
+        Compiled ``kernel(values, window, z_thresh)`` returning
+        ``(mean, std, z, is_spike)`` arrays, or None if Numba is not installed
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    values_type = numba.types.Array(numba.float64, 1, 'A', readonly=True)
+    signature = numba.types.Tuple((
+        numba.float64[:], numba.float64[:], numba.float64[:], numba.boolean[:]
+    ))(values_type, numba.int64, numba.float64)
+
+    @numba.njit(signature, cache=True)
+    def rolling_z(values, window, z_thresh):
+        n = values.shape[0]
+        mean = np.empty(n)
+        std = np.empty(n)
+        z = np.zeros(n)
+        is_spike = np.zeros(n, dtype=np.bool_)
+        for i in range(n):
+            # Windows are small, so a direct two-pass mean/variance per window
+            # is cheap and keeps flat windows at exactly 0 (no running-sum drift)
+            start = max(0, i - window + 1)
+            count = 0
+            total = 0.0
+            for j in range(start, i + 1):
+                if not np.isnan(values[j]):
+                    count += 1
+                    total += values[j]
+            if count == 0:
+                mean[i] = np.nan
+                std[i] = np.nan
+                continue
+            m = total / count
+            mean[i] = m
+            if count < 2:
+                std[i] = np.nan
+                continue
+            sq_dev = 0.0
+            for j in range(start, i + 1):
+                if not np.isnan(values[j]):
+                    sq_dev += (values[j] - m) * (values[j] - m)
+            s = math.sqrt(sq_dev / (count - 1))
+            std[i] = s
+            if s > 0 and not np.isnan(values[i]):
+                z[i] = (values[i] - m) / s
+                is_spike[i] = abs(z[i]) > z_thresh
+        return mean, std, z, is_spike
+
+    return rolling_z
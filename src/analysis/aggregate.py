@@ -5,26 +5,36 @@ This module provides functionality to create monthly aggregations of adverse eve
 and generate visualization plots for trend analysis.
 """
 
+import functools
+import hashlib
 import logging
+import os
+import re
+import shutil
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Union
 
 import pandas as pd
 import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
 import matplotlib.pyplot as plt
 import matplotlib.dates as mdates
+from matplotlib.figure import Figure
 from datetime import datetime, date
 import warnings
 
 # Import configuration - handle both relative and absolute imports
 try:
-    from ..config import ANALYSIS_CONFIG, LOGGING_CONFIG
+    from ..config import ANALYSIS_CONFIG, CACHE_DIR, LOGGING_CONFIG
+    from ._kernels import PARALLEL_MAX_THREADS, get_count_kernel
 except ImportError:
     # Fallback for direct execution
     import sys
     from pathlib import Path
     sys.path.insert(0, str(Path(__file__).parent.parent))
-    from config import ANALYSIS_CONFIG, LOGGING_CONFIG
+    from config import ANALYSIS_CONFIG, CACHE_DIR, LOGGING_CONFIG
+    from analysis._kernels import PARALLEL_MAX_THREADS, get_count_kernel
 
 # Configure logging
 logging.basicConfig(
@@ -36,6 +46,136 @@ logger = logging.getLogger(__name__)
 # Suppress matplotlib warnings
 warnings.filterwarnings("ignore", category=UserWarning)
 
+# Largest (months x keys) matrix the optional Numba count kernel may allocate
+DENSE_COUNT_MAX_CELLS = 10_000_000
+# Row count above which the multi-threaded count kernel pays off
+PARALLEL_COUNT_MIN_ROWS = 1_000_000
+
+# Qualitative palettes for the top-N line plots, built once at import
+_TAB10 = plt.cm.tab10(np.arange(10))
+_TAB20 = plt.cm.tab20(np.arange(20))
+
+# Bump when the aggregation output changes so stale cache entries are ignored
+AGGREGATION_CACHE_VERSION = 2
+AGGREGATION_CACHE_FILES = ('monthly_counts', 'monthly_by_reaction', 'monthly_by_drug')
+AGGREGATION_CACHE_DIR = CACHE_DIR / 'aggregations'
+
+def ensure_datetime(df: pd.DataFrame, date_col: str = 'event_date') -> pd.Series:
+    """
+    Return a date column as datetime64, coercing unparseable values to NaT.
+    
+    Columns that are already datetime64 are returned as-is without a parse.
+    Raw FAERS dates (YYYYMMDD strings) are parsed with an explicit format,
+    which takes pandas' fast vectorized path instead of per-value inference.
+    
+    Args:
+        df: DataFrame with the date column
+        date_col: Name of the date column
+        
+    Returns:
+        Series of datetime64 values
+    """
+    dates = df[date_col]
+    if pd.api.types.is_datetime64_any_dtype(dates):
+        return dates
+    
+    sample = dates.dropna()[:1]
+    date_format = None
+    if len(sample) and re.fullmatch(r'\d{8}', str(sample.iloc[0]).strip()):
+        date_format = '%Y%m%d'
+    
+    return pd.to_datetime(dates, format=date_format, errors='coerce')
+
+def _month_keys(dates: np.ndarray) -> np.ndarray:
+    """
+    Bucket datetimes to integer month keys (months since 1970-01).
+    
+    Integer keys are cheaper to hash and compare than datetimes; they are only
+    turned back into month-start timestamps in the returned frames.
+    """
+    return dates.astype('datetime64[M]').view('i8')
+
+def _month_starts(month_keys: np.ndarray) -> np.ndarray:
+    """Convert integer month keys back to first-of-month datetime64[ns] values."""
+    return month_keys.astype('datetime64[M]').astype('datetime64[ns]')
+
+def _count_by_month(month_keys: np.ndarray) -> pd.DataFrame:
+    """
+    Count occurrences of each month.
+    
+    Args:
+        month_keys: Integer month keys from _month_keys
+        
+    Returns:
+        DataFrame with monthly counts (ym, count) sorted by month
+    """
+    months, counts = np.unique(month_keys, return_counts=True)
+    # Monthly counts fit comfortably in int32; a fixed width (rather than the
+    # narrowest type) keeps arithmetic on the public column from overflowing
+    return pd.DataFrame({'ym': _month_starts(months),
+                         'count': counts.astype(np.int32)})
+
+def _count_by_month_and_key(month_df: pd.DataFrame, key_col: str, out_col: str) -> pd.DataFrame:
+    """
+    Count rows per (ym, key) on a frame that already carries a month bucket.
+    
+    Args:
+        month_df: DataFrame with integer month keys in 'ym' and key_col columns
+        key_col: Name of the key column to count by
+        out_col: Name of the key column in the output
+        
+    Returns:
+        DataFrame with monthly counts by key (ym, out_col, count) sorted by ym
+    """
+    month_df = month_df[['ym', key_col]].dropna(subset=[key_col])
+    
+    if month_df.empty:
+        return pd.DataFrame(columns=['ym', out_col, 'count'])
+    
+    # Group on categorical codes rather than hashing every string
+    keys = month_df[key_col].astype('category')
+    categories = keys.cat.categories
+    codes = keys.cat.codes.to_numpy()
+    month_i8 = month_df['ym'].to_numpy()
+    months = np.unique(month_i8)
+    
+    n_cells = len(months) * len(categories)
+    # The threaded kernel keeps one partial matrix per thread, so it is only
+    # used for large inputs whose matrix stays small
+    parallel = (len(codes) > PARALLEL_COUNT_MIN_ROWS
+                and n_cells * PARALLEL_MAX_THREADS <= DENSE_COUNT_MAX_CELLS)
+    kernel = get_count_kernel(codes.dtype.name, parallel)
+    if kernel is not None and n_cells <= DENSE_COUNT_MAX_CELLS:
+        # Fill a dense (month, code) matrix with the compiled kernel, then
+        # keep only the non-zero cells in long format
+        dense = np.zeros((len(months), len(categories)), dtype=np.int64)
+        month_idx = np.searchsorted(months, month_i8).astype(np.int64, copy=False)
+        kernel(month_idx, codes, dense)
+        month_idx, code_idx = np.nonzero(dense)
+        month_keys, counts_arr = months[month_idx], dense[month_idx, code_idx]
+    else:
+        # Hash-aggregate the (month, code) integer pairs in Arrow's C++ group_by
+        table = pa.table({'ym': month_i8, 'code': codes})
+        grouped = table.group_by(['ym', 'code']).aggregate([('ym', 'count')])
+        month_keys = grouped.column('ym').to_numpy()
+        code_idx = grouped.column('code').to_numpy()
+        counts_arr = grouped.column('ym_count').to_numpy()
+    
+    counts = pd.DataFrame({
+        'ym': _month_starts(month_keys),
+        key_col: categories.take(code_idx),
+        'count': counts_arr
+    })
+    counts[key_col] = counts[key_col].astype(month_df[key_col].dtype)
+    # Per-key monthly counts are small; int32 halves the column without the
+    # overflow risk of narrower types in downstream arithmetic
+    counts['count'] = counts['count'].astype(np.int32)
+    
+    # Consumers re-group or pivot by month, so only ym order is guaranteed;
+    # a stable sort keeps the grouping order within each month
+    counts = counts.rename(columns={key_col: out_col})
+    return counts.sort_values('ym', kind='mergesort', ignore_index=True)
+
 def monthly_overall(df: pd.DataFrame, date_col: str = 'event_date') -> pd.DataFrame:
     """
     Create monthly overall adverse event counts.
@@ -58,32 +198,23 @@ def monthly_overall(df: pd.DataFrame, date_col: str = 'event_date') -> pd.DataFr
         logger.error(f"Date column '{date_col}' not found in DataFrame")
         return pd.DataFrame(columns=['ym', 'count'])
     
-    # Convert to datetime if needed
-    if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
-        df = df.copy()
-        df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+    # Convert to datetime if needed; only the date column is touched
+    dates = ensure_datetime(df, date_col)
     
     # Remove rows with invalid dates
-    initial_count = len(df)
-    df_clean = df.dropna(subset=[date_col])
-    final_count = len(df_clean)
+    initial_count = len(dates)
+    dates = dates.dropna()
+    final_count = len(dates)
     
     if initial_count != final_count:
         logger.info(f"Removed {initial_count - final_count} rows with invalid dates")
     
-    if df_clean.empty:
+    if dates.empty:
         logger.warning("No valid dates found")
         return pd.DataFrame(columns=['ym', 'count'])
     
-    # Create year-month column (first day of month)
-    df_clean = df_clean.copy()
-    df_clean['ym'] = df_clean[date_col].dt.to_period('M').dt.start_time
-    
-    # Count events per month
-    monthly_counts = df_clean.groupby('ym').size().reset_index(name='count')
-    
-    # Sort by date
-    monthly_counts = monthly_counts.sort_values('ym')
+    # Count events per month (np.unique returns the months already sorted)
+    monthly_counts = _count_by_month(_month_keys(dates.values))
     
     logger.info(f"Created monthly aggregation: {len(monthly_counts)} months, "
                 f"{monthly_counts['count'].sum()} total events")
@@ -117,32 +248,23 @@ def monthly_by_reaction(df: pd.DataFrame,
         logger.error(f"Missing columns: {missing_cols}")
         return pd.DataFrame(columns=['ym', 'reaction_pt', 'count'])
     
-    # Convert to datetime if needed
-    if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
-        df = df.copy()
-        df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+    # Convert to datetime if needed; only the date column is touched
+    dates = ensure_datetime(df, date_col)
     
     # Remove rows with invalid dates or missing reactions
-    df_clean = df.dropna(subset=[date_col, reaction_col])
+    valid = (dates.notna() & df[reaction_col].notna()).to_numpy()
     
-    if df_clean.empty:
+    if not valid.any():
         logger.warning("No valid data found")
         return pd.DataFrame(columns=['ym', 'reaction_pt', 'count'])
     
-    # Create year-month column
-    df_clean = df_clean.copy()
-    df_clean['ym'] = df_clean[date_col].dt.to_period('M').dt.start_time
-    
-    # Count events per month by reaction
-    monthly_reaction_counts = (df_clean.groupby(['ym', reaction_col])
-                              .size()
-                              .reset_index(name='count'))
-    
-    # Rename reaction column for consistency
-    monthly_reaction_counts = monthly_reaction_counts.rename(columns={reaction_col: 'reaction_pt'})
+    # Project the key column and month bucket into a narrow frame (no full copy)
+    df_clean = df.loc[valid, [reaction_col]].assign(
+        ym=_month_keys(dates.to_numpy()[valid])
+    )
     
-    # Sort by date and count
-    monthly_reaction_counts = monthly_reaction_counts.sort_values(['ym', 'count'], ascending=[True, False])
+    # Count events per month by reaction on categorical codes
+    monthly_reaction_counts = _count_by_month_and_key(df_clean, reaction_col, 'reaction_pt')
     
     unique_reactions = monthly_reaction_counts['reaction_pt'].nunique()
     logger.info(f"Created monthly by reaction aggregation: {len(monthly_reaction_counts)} records, "
@@ -177,32 +299,23 @@ def monthly_by_drug(df: pd.DataFrame,
         logger.error(f"Missing columns: {missing_cols}")
         return pd.DataFrame(columns=['ym', 'drug', 'count'])
     
-    # Convert to datetime if needed
-    if not pd.api.types.is_datetime64_any_dtype(df[date_col]):
-        df = df.copy()
-        df[date_col] = pd.to_datetime(df[date_col], errors='coerce')
+    # Convert to datetime if needed; only the date column is touched
+    dates = ensure_datetime(df, date_col)
     
     # Remove rows with invalid dates or missing drugs
-    df_clean = df.dropna(subset=[date_col, drug_col])
+    valid = (dates.notna() & df[drug_col].notna()).to_numpy()
     
-    if df_clean.empty:
+    if not valid.any():
         logger.warning("No valid data found")
         return pd.DataFrame(columns=['ym', 'drug', 'count'])
     
-    # Create year-month column
-    df_clean = df_clean.copy()
-    df_clean['ym'] = df_clean[date_col].dt.to_period('M').dt.start_time
+    # Project the key column and month bucket into a narrow frame (no full copy)
+    df_clean = df.loc[valid, [drug_col]].assign(
+        ym=_month_keys(dates.to_numpy()[valid])
+    )
     
-    # Count events per month by drug
-    monthly_drug_counts = (df_clean.groupby(['ym', drug_col])
-                          .size()
-                          .reset_index(name='count'))
-    
-    # Rename drug column for consistency
-    monthly_drug_counts = monthly_drug_counts.rename(columns={drug_col: 'drug'})
-    
-    # Sort by date and count
-    monthly_drug_counts = monthly_drug_counts.sort_values(['ym', 'count'], ascending=[True, False])
+    # Count events per month by drug on categorical codes
+    monthly_drug_counts = _count_by_month_and_key(df_clean, drug_col, 'drug')
     
     unique_drugs = monthly_drug_counts['drug'].nunique()
     logger.info(f"Created monthly by drug aggregation: {len(monthly_drug_counts)} records, "
@@ -210,6 +323,44 @@ def monthly_by_drug(df: pd.DataFrame,
     
     return monthly_drug_counts
 
+def _top_totals(df: pd.DataFrame, column: str, k: int) -> pd.Series:
+    """
+    Sum 'count' per value of a column and return the k largest totals.
+    
+    Totals are reduced with np.bincount over categorical codes and the top k
+    selected with np.argpartition, so only the k winners are fully sorted.
+    
+    Args:
+        df: DataFrame with the specified column and 'count' column
+        column: Column whose values are ranked
+        k: Number of top items to return
+        
+    Returns:
+        Series of totals indexed by item, sorted descending
+    """
+    # Filtered categorical columns keep unused categories; drop them so only
+    # values present in df can be ranked
+    cat = pd.Categorical(df[column]).remove_unused_categories()
+    valid = cat.codes >= 0
+    weights = df['count'].to_numpy(dtype=np.float64, na_value=0.0)
+    totals = np.bincount(cat.codes[valid], weights=weights[valid],
+                         minlength=len(cat.categories))
+    
+    k = max(0, min(k, len(totals)))
+    if 0 < k < len(totals):
+        top_idx = np.argpartition(-totals, k - 1)[:k]
+    else:
+        top_idx = np.arange(k)
+    top_idx = top_idx[np.argsort(-totals[top_idx], kind='stable')]
+    
+    top_totals = totals[top_idx]
+    if pd.api.types.is_integer_dtype(df['count']):
+        top_totals = top_totals.astype(np.int64)
+    
+    return pd.Series(top_totals,
+                     index=pd.Index(cat.categories.take(top_idx), name=column),
+                     name='count')
+
 def get_top_items(df: pd.DataFrame, 
                  group_col: str, 
                  top_n: int = 10) -> List[str]:
@@ -227,20 +378,127 @@ def get_top_items(df: pd.DataFrame,
     if df.empty or group_col not in df.columns:
         return []
     
-    top_items = (df.groupby(group_col)['count']
-                .sum()
-                .sort_values(ascending=False)
-                .head(top_n)
-                .index
-                .tolist())
+    top_items = _top_totals(df, group_col, top_n).index.tolist()
     
     return top_items
 
+def _new_figure(figsize: Tuple[float, float]) -> Tuple[Figure, plt.Axes]:
+    """
+    Create a figure with a single axes outside of pyplot.
+    
+    The figure is not registered with pyplot, so saving renders straight
+    through Agg with no GUI backend and nothing needs closing afterwards.
+    The tight layout engine runs once per save instead of per explicit call.
+    
+    Args:
+        figsize: Figure size in inches
+        
+    Returns:
+        Tuple of (figure, axes)
+    """
+    fig = Figure(figsize=figsize, layout='tight')
+    return fig, fig.add_subplot()
+
+def _style_trend_axes(ax: plt.Axes, title: str, minor_locator: bool = True) -> None:
+    """
+    Apply the shared title, labels, grid and yearly date axis of trend plots.
+    
+    Args:
+        ax: Axes to style
+        title: Plot title
+        minor_locator: Whether to add January/July minor ticks
+    """
+    ax.set_title(title, fontsize=16, fontweight='bold')
+    ax.set_xlabel('Date', fontsize=12)
+    ax.set_ylabel('Number of Events', fontsize=12)
+    ax.grid(True, alpha=0.3)
+    
+    # Format x-axis dates; locators and formatters are bound to one axis each
+    ax.xaxis.set_major_locator(mdates.YearLocator())
+    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
+    if minor_locator:
+        ax.xaxis.set_minor_locator(mdates.MonthLocator([1, 7]))
+    ax.tick_params(axis='x', labelrotation=45)
+
+def _save_kwargs(quick: bool) -> Dict:
+    """
+    savefig options for publication output or fast draft renders.
+    
+    Draft mode renders at 100 DPI (about 9x fewer pixels than 300 DPI) and
+    skips the tight bounding-box pass; figures already use the tight layout
+    engine, so labels stay inside the canvas.
+    
+    Args:
+        quick: Whether to render draft-quality plots
+        
+    Returns:
+        Keyword arguments for Figure.savefig
+    """
+    if quick:
+        return {'dpi': 100}
+    return {'dpi': ANALYSIS_CONFIG['plot_dpi'], 'bbox_inches': 'tight'}
+
+def _spread_colors(palette: np.ndarray, n: int) -> np.ndarray:
+    """
+    Pick n colors spread evenly across a precomputed palette.
+    
+    Matches ``cmap(np.linspace(0, 1, n))`` for a listed colormap without
+    re-running the colormap lookup on every plot.
+    """
+    idx = np.minimum((np.linspace(0, 1, n) * len(palette)).astype(int), len(palette) - 1)
+    return palette[idx]
+
+def _item_codes(values: pd.Series, items: List[str]) -> np.ndarray:
+    """
+    Position of each value in ``items``, or -1 for values outside it.
+    
+    Categorical columns are matched on their integer codes with np.isin, so
+    only the categories are compared as strings.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        item_codes = values.cat.categories.get_indexer(items)
+        codes = values.cat.codes.to_numpy()
+        mask = np.isin(codes, item_codes[item_codes >= 0])
+        # Map category codes to positions in items
+        lookup = np.full(len(values.cat.categories), -1, dtype=np.intp)
+        lookup[item_codes[item_codes >= 0]] = np.flatnonzero(item_codes >= 0)
+        return np.where(mask, lookup[codes], -1)
+    return pd.Categorical(values, categories=items).codes
+
+def _pivot_counts(df: pd.DataFrame, column: str, items: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Scatter monthly counts of the given items into a dense (month x item) matrix.
+    
+    Equivalent to filtering with ``isin(items)`` and then
+    ``pivot(index='ym', columns=column, values='count').fillna(0)`` with
+    columns in ``items`` order, without building intermediate DataFrames.
+    
+    Args:
+        df: Monthly counts DataFrame (ym, column, count)
+        column: Item column name
+        items: Items defining the matrix columns
+        
+    Returns:
+        Tuple of (sorted months, counts matrix)
+    """
+    item_idx = _item_codes(df[column], items)
+    keep = item_idx >= 0
+    item_idx = item_idx[keep]
+    
+    ym = df['ym'].to_numpy()[keep]
+    months = np.unique(ym)
+    month_idx = np.searchsorted(months, ym)
+    
+    counts = np.zeros((len(months), len(items)))
+    np.add.at(counts, (month_idx, item_idx), df['count'].to_numpy()[keep])
+    return months, counts
+
 def save_plots(monthly_overall_df: pd.DataFrame,
               monthly_reaction_df: pd.DataFrame,
               monthly_drug_df: pd.DataFrame,
               output_dir: Union[str, Path],
-              top_n: int = 10) -> None:
+              top_n: int = 10,
+              quick: bool = False) -> None:
     """
     Generate and save trend analysis plots.
     
@@ -250,46 +508,40 @@ def save_plots(monthly_overall_df: pd.DataFrame,
         monthly_drug_df: Monthly by drug DataFrame
         output_dir: Directory to save plots
         top_n: Number of top items to plot
+        quick: Render fast draft-quality plots (100 DPI, no tight bbox)
     """
     logger.info(f"Generating plots and saving to {output_dir}")
     
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
+    save_kwargs = _save_kwargs(quick)
+    
     # Set up matplotlib style
     plt.style.use('default')
     plt.rcParams['figure.figsize'] = (12, 8)
     plt.rcParams['font.size'] = 10
     
+    # One figure is reused for the three trend plots
+    fig, ax = _new_figure((12, 6))
+    
     # 1. Overall trend plot
     if not monthly_overall_df.empty:
         logger.info("Creating overall trend plot")
         
-        fig, ax = plt.subplots(figsize=(12, 6))
-        
         # Plot overall trend
         ax.plot(monthly_overall_df['ym'], monthly_overall_df['count'], 
                 marker='o', linewidth=2, markersize=4, color='steelblue')
         
-        ax.set_title('Adverse Events Trend Over Time', fontsize=16, fontweight='bold')
-        ax.set_xlabel('Date', fontsize=12)
-        ax.set_ylabel('Number of Events', fontsize=12)
-        ax.grid(True, alpha=0.3)
-        
-        # Format x-axis dates
-        ax.xaxis.set_major_locator(mdates.YearLocator())
-        ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-        ax.xaxis.set_minor_locator(mdates.MonthLocator([1, 7]))
-        
-        plt.xticks(rotation=45)
-        plt.tight_layout()
+        _style_trend_axes(ax, 'Adverse Events Trend Over Time')
         
         plot_path = output_path / 'overall_trend.png'
-        plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-        plt.close()
+        fig.savefig(plot_path, **save_kwargs)
         
         logger.info(f"Saved overall trend plot to {plot_path}")
     
+    fig.set_size_inches(14, 8)
+    
     # 2. Top reactions plot
     if not monthly_reaction_df.empty:
         logger.info("Creating top reactions plot")
@@ -297,43 +549,24 @@ def save_plots(monthly_overall_df: pd.DataFrame,
         top_reactions = get_top_items(monthly_reaction_df, 'reaction_pt', top_n)
         
         if top_reactions:
-            fig, ax = plt.subplots(figsize=(14, 8))
+            ax.clear()
             
-            # Filter data for top reactions
-            top_reaction_data = monthly_reaction_df[
-                monthly_reaction_df['reaction_pt'].isin(top_reactions)
-            ]
+            # Dense (month x reaction) matrix for easier plotting
+            months, counts = _pivot_counts(monthly_reaction_df, 'reaction_pt', top_reactions)
             
-            # Create pivot table for easier plotting
-            pivot_data = top_reaction_data.pivot(index='ym', 
-                                               columns='reaction_pt', 
-                                               values='count').fillna(0)
+            # Plot all reaction lines in one call, in ranking order
+            colors = _spread_colors(_TAB10, len(top_reactions))
             
-            # Plot lines for each reaction
-            colors = plt.cm.tab10(np.linspace(0, 1, len(top_reactions)))
+            lines = ax.plot(months, counts, marker='o', linewidth=2, markersize=3)
+            for line, name, color in zip(lines, top_reactions, colors):
+                line.set_label(name)
+                line.set_color(color)
             
-            for i, reaction in enumerate(top_reactions[:top_n]):
-                if reaction in pivot_data.columns:
-                    ax.plot(pivot_data.index, pivot_data[reaction], 
-                           marker='o', label=reaction, linewidth=2, 
-                           markersize=3, color=colors[i])
-            
-            ax.set_title(f'Top {top_n} Adverse Reactions Trend', fontsize=16, fontweight='bold')
-            ax.set_xlabel('Date', fontsize=12)
-            ax.set_ylabel('Number of Events', fontsize=12)
-            ax.grid(True, alpha=0.3)
+            _style_trend_axes(ax, f'Top {top_n} Adverse Reactions Trend', minor_locator=False)
             ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
             
-            # Format x-axis dates
-            ax.xaxis.set_major_locator(mdates.YearLocator())
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-            
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            
             plot_path = output_path / 'top_reactions_trend.png'
-            plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            fig.savefig(plot_path, **save_kwargs)
             
             logger.info(f"Saved top reactions plot to {plot_path}")
     
@@ -344,50 +577,32 @@ def save_plots(monthly_overall_df: pd.DataFrame,
         top_drugs = get_top_items(monthly_drug_df, 'drug', top_n)
         
         if top_drugs:
-            fig, ax = plt.subplots(figsize=(14, 8))
+            ax.clear()
             
-            # Filter data for top drugs
-            top_drug_data = monthly_drug_df[
-                monthly_drug_df['drug'].isin(top_drugs)
-            ]
+            # Dense (month x drug) matrix for easier plotting
+            months, counts = _pivot_counts(monthly_drug_df, 'drug', top_drugs)
             
-            # Create pivot table for easier plotting
-            pivot_data = top_drug_data.pivot(index='ym', 
-                                           columns='drug', 
-                                           values='count').fillna(0)
+            # Plot all drug lines in one call, in ranking order
+            colors = _spread_colors(_TAB20, len(top_drugs))
             
-            # Plot lines for each drug
-            colors = plt.cm.tab20(np.linspace(0, 1, len(top_drugs)))
+            lines = ax.plot(months, counts, marker='o', linewidth=2, markersize=3)
+            for line, name, color in zip(lines, top_drugs, colors):
+                line.set_label(name)
+                line.set_color(color)
             
-            for i, drug in enumerate(top_drugs[:top_n]):
-                if drug in pivot_data.columns:
-                    ax.plot(pivot_data.index, pivot_data[drug], 
-                           marker='o', label=drug, linewidth=2, 
-                           markersize=3, color=colors[i])
-            
-            ax.set_title(f'Top {top_n} Drugs Adverse Events Trend', fontsize=16, fontweight='bold')
-            ax.set_xlabel('Date', fontsize=12)
-            ax.set_ylabel('Number of Events', fontsize=12)
-            ax.grid(True, alpha=0.3)
+            _style_trend_axes(ax, f'Top {top_n} Drugs Adverse Events Trend', minor_locator=False)
             ax.legend(bbox_to_anchor=(1.05, 1), loc='upper left')
             
-            # Format x-axis dates
-            ax.xaxis.set_major_locator(mdates.YearLocator())
-            ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-            
-            plt.xticks(rotation=45)
-            plt.tight_layout()
-            
             plot_path = output_path / 'top_drugs_trend.png'
-            plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            fig.savefig(plot_path, **save_kwargs)
             
             logger.info(f"Saved top drugs plot to {plot_path}")
     
     # 4. Summary statistics plot
     logger.info("Creating summary statistics plot")
     
-    fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(16, 12))
+    fig = Figure(figsize=(16, 12), layout='tight')
+    ((ax1, ax2), (ax3, ax4)) = fig.subplots(2, 2)
     
     # Overall events bar chart (yearly)
     if not monthly_overall_df.empty:
@@ -446,19 +661,101 @@ def save_plots(monthly_overall_df: pd.DataFrame,
         ax4.text(0.02, 0.98, stats_text, transform=ax4.transAxes, 
                 verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.5))
     
-    plt.suptitle('Adverse Events Analysis Summary', fontsize=18, fontweight='bold')
-    plt.tight_layout()
+    fig.suptitle('Adverse Events Analysis Summary', fontsize=18, fontweight='bold')
     
     plot_path = output_path / 'summary_statistics.png'
-    plt.savefig(plot_path, dpi=300, bbox_inches='tight')
-    plt.close()
+    fig.savefig(plot_path, **save_kwargs)
     
     logger.info(f"Saved summary statistics plot to {plot_path}")
 
+def _events_cache_key(events_df: pd.DataFrame) -> Optional[str]:
+    """
+    Content hash of the columns the monthly aggregations depend on.
+    
+    Args:
+        events_df: FAERS events DataFrame
+        
+    Returns:
+        Hex digest, or None when the input is not worth caching
+    """
+    key_cols = ['event_date', 'reaction_pt', 'drug']
+    if events_df.empty or any(col not in events_df.columns for col in key_cols):
+        return None
+    
+    row_hashes = pd.util.hash_pandas_object(events_df[key_cols], index=False).to_numpy()
+    digest = hashlib.sha1(row_hashes.tobytes())
+    dtypes = ','.join(str(dtype) for dtype in events_df[key_cols].dtypes)
+    digest.update(f"v{AGGREGATION_CACHE_VERSION}:{dtypes}".encode())
+    return digest.hexdigest()
+
+def _evict_aggregation_cache() -> None:
+    """Delete the least recently used aggregation cache entries beyond the limit."""
+    max_entries = ANALYSIS_CONFIG.get('aggregation_cache_max_entries', 8)
+    entries = sorted((p for p in AGGREGATION_CACHE_DIR.iterdir() if p.is_dir()),
+                     key=lambda p: p.stat().st_mtime)
+    for stale in entries[:max(0, len(entries) - max_entries)]:
+        shutil.rmtree(stale, ignore_errors=True)
+
+def _disk_cache(key_fn):
+    """
+    Cache a function returning a tuple of DataFrames as Parquet files.
+    
+    Results are stored under ``AGGREGATION_CACHE_DIR/<key>/`` with zstd
+    compression and dictionary-encoded string columns, keyed by
+    ``key_fn(first_arg)``. The cache is off by default (the ETL CLI turns on
+    ``ANALYSIS_CONFIG['aggregation_cache']``) and is skipped when the key
+    function returns None; unreadable or unwritable cache entries fall back
+    to recomputing. Only the ``aggregation_cache_max_entries`` most recently
+    used entries are kept.
+    
+    Args:
+        key_fn: Callable mapping the first argument to a cache key or None
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(df, *args, **kwargs):
+            key = key_fn(df) if ANALYSIS_CONFIG.get('aggregation_cache', False) else None
+            if key is None:
+                return func(df, *args, **kwargs)
+            
+            cache_dir = AGGREGATION_CACHE_DIR / key
+            paths = [cache_dir / f"{name}.parquet" for name in AGGREGATION_CACHE_FILES]
+            
+            if all(path.exists() for path in paths):
+                try:
+                    # Plain NumPy-backed read rather than dtype_backend='pyarrow':
+                    # a hit must return the same dtypes as a fresh computation,
+                    # and dtype_backend needs pandas 2.0 (requirements allow 1.5)
+                    result = tuple(pd.read_parquet(path) for path in paths)
+                    os.utime(cache_dir)
+                    logger.info(f"Loaded cached aggregations from {cache_dir}")
+                    return result
+                except (OSError, pa.ArrowException) as e:
+                    logger.warning(f"Ignoring unreadable aggregation cache {cache_dir}: {e}")
+            
+            result = func(df, *args, **kwargs)
+            
+            try:
+                cache_dir.mkdir(parents=True, exist_ok=True)
+                for frame, path in zip(result, paths):
+                    table = pa.Table.from_pandas(frame, preserve_index=False)
+                    pq.write_table(table, path, compression='zstd', use_dictionary=True)
+                _evict_aggregation_cache()
+            except (OSError, pa.ArrowException) as e:
+                logger.warning(f"Could not write aggregation cache {cache_dir}: {e}")
+            
+            return result
+        return wrapper
+    return decorator
+
+@_disk_cache(_events_cache_key)
 def create_all_aggregations(events_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
     """
     Create all monthly aggregations from events DataFrame.
     
+    Dates are coerced, cleaned and bucketed to month once and shared by all
+    three aggregations instead of being recomputed by each of them.
+    
     Args:
         events_df: FAERS events DataFrame
         
@@ -467,18 +764,53 @@ def create_all_aggregations(events_df: pd.DataFrame) -> Tuple[pd.DataFrame, pd.D
     """
     logger.info("Creating all monthly aggregations")
     
+    date_col, reaction_col, drug_col = 'event_date', 'reaction_pt', 'drug'
+    required_cols = [date_col, reaction_col, drug_col]
+    if events_df.empty or any(col not in events_df.columns for col in required_cols):
+        # Let the individual aggregations report on degenerate input
+        return (monthly_overall(events_df),
+                monthly_by_reaction(events_df),
+                monthly_by_drug(events_df))
+    
+    # Convert to datetime once for all three aggregations
+    dates = ensure_datetime(events_df, date_col)
+    
+    # Remove rows with invalid dates
+    valid = dates.notna().to_numpy()
+    n_invalid = len(valid) - int(valid.sum())
+    if n_invalid:
+        logger.info(f"Removed {n_invalid} rows with invalid dates")
+    
+    if n_invalid == len(valid):
+        logger.warning("No valid dates found")
+        return (pd.DataFrame(columns=['ym', 'count']),
+                pd.DataFrame(columns=['ym', 'reaction_pt', 'count']),
+                pd.DataFrame(columns=['ym', 'drug', 'count']))
+    
+    # Integer year-month key computed once for all three aggregations
+    month_df = events_df.loc[valid, [reaction_col, drug_col]].assign(
+        ym=_month_keys(dates.to_numpy()[valid])
+    )
+    
     # Overall monthly counts
-    monthly_overall_df = monthly_overall(events_df)
+    monthly_overall_df = _count_by_month(month_df['ym'].to_numpy())
+    logger.info(f"Created monthly aggregation: {len(monthly_overall_df)} months, "
+                f"{monthly_overall_df['count'].sum()} total events")
     
     # Monthly by reaction
-    monthly_reaction_df = monthly_by_reaction(events_df)
+    monthly_reaction_df = _count_by_month_and_key(month_df, reaction_col, 'reaction_pt')
+    logger.info(f"Created monthly by reaction aggregation: {len(monthly_reaction_df)} records, "
+                f"{monthly_reaction_df['reaction_pt'].nunique()} unique reactions")
     
     # Monthly by drug
-    monthly_drug_df = monthly_by_drug(events_df)
+    monthly_drug_df = _count_by_month_and_key(month_df, drug_col, 'drug')
+    logger.info(f"Created monthly by drug aggregation: {len(monthly_drug_df)} records, "
+                f"{monthly_drug_df['drug'].nunique()} unique drugs")
     
     return monthly_overall_df, monthly_reaction_df, monthly_drug_df
 
-def plot_monthly(df: pd.DataFrame, title: str, out_path: Union[str, Path]) -> None:
+def plot_monthly(df: pd.DataFrame, title: str, out_path: Union[str, Path],
+                 quick: bool = False) -> None:
     """
     Create a monthly trend plot using matplotlib.
     
@@ -486,6 +818,7 @@ def plot_monthly(df: pd.DataFrame, title: str, out_path: Union[str, Path]) -> No
         df: DataFrame with 'ym' (year-month) and 'count' columns
         title: Plot title
         out_path: Output file path for saving the plot
+        quick: Render a fast draft-quality plot (100 DPI, no tight bbox)
     """
     logger.info(f"Creating monthly plot: {title}")
     
@@ -498,25 +831,15 @@ def plot_monthly(df: pd.DataFrame, title: str, out_path: Union[str, Path]) -> No
         return
     
     # Create the plot
-    fig, ax = plt.subplots(figsize=ANALYSIS_CONFIG['plot_figsize'])
+    fig, ax = _new_figure(ANALYSIS_CONFIG['plot_figsize'])
     
     # Plot the trend line
     ax.plot(df['ym'], df['count'], marker='o', linewidth=2, markersize=4, 
             color='steelblue', alpha=0.8)
     
     # Customize the plot
+    _style_trend_axes(ax, title)
     ax.set_title(title, fontsize=16, fontweight='bold', pad=20)
-    ax.set_xlabel('Date', fontsize=12)
-    ax.set_ylabel('Number of Events', fontsize=12)
-    ax.grid(True, alpha=0.3)
-    
-    # Format x-axis dates
-    ax.xaxis.set_major_locator(mdates.YearLocator())
-    ax.xaxis.set_major_formatter(mdates.DateFormatter('%Y'))
-    ax.xaxis.set_minor_locator(mdates.MonthLocator([1, 7]))
-    
-    # Rotate x-axis labels for better readability
-    plt.xticks(rotation=45)
     
     # Add some statistics as text
     if len(df) > 0:
@@ -528,15 +851,11 @@ def plot_monthly(df: pd.DataFrame, title: str, out_path: Union[str, Path]) -> No
         ax.text(0.02, 0.98, stats_text, transform=ax.transAxes, 
                 verticalalignment='top', bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
     
-    # Adjust layout and save
-    plt.tight_layout()
-    
     # Ensure output directory exists
     out_path = Path(out_path)
     out_path.parent.mkdir(parents=True, exist_ok=True)
     
-    plt.savefig(out_path, dpi=ANALYSIS_CONFIG['plot_dpi'], bbox_inches='tight')
-    plt.close()
+    fig.savefig(out_path, **_save_kwargs(quick))
     
     logger.info(f"Saved monthly plot to {out_path}")
 
@@ -566,11 +885,8 @@ def top_k(df: pd.DataFrame, column: str, k: int = 10) -> pd.Series:
         logger.error("DataFrame must have 'count' column")
         return pd.Series(dtype=int)
     
-    # Group by the specified column and sum counts
-    top_items = (df.groupby(column)['count']
-                .sum()
-                .sort_values(ascending=False)
-                .head(k))
+    # Sum counts per item and keep the k largest
+    top_items = _top_totals(df, column, k)
     
     logger.info(f"Found top {len(top_items)} items in '{column}'")
     
@@ -580,7 +896,8 @@ def save_trend_plots(monthly_overall_df: pd.DataFrame,
                     monthly_reaction_df: pd.DataFrame,
                     monthly_drug_df: pd.DataFrame,
                     output_dir: Union[str, Path],
-                    top_n: int = 10) -> None:
+                    top_n: int = 10,
+                    quick: bool = False) -> None:
     """
     Generate and save the three requested trend plots: overall, top reactions bar, top drugs bar.
     
@@ -590,16 +907,22 @@ def save_trend_plots(monthly_overall_df: pd.DataFrame,
         monthly_drug_df: Monthly by drug DataFrame
         output_dir: Directory to save plots
         top_n: Number of top items to include in bar plots (default: 10)
+        quick: Render fast draft-quality plots (100 DPI, no tight bbox)
     """
     logger.info(f"Generating trend plots and saving to {output_dir}")
     
     output_path = Path(output_dir)
     output_path.mkdir(parents=True, exist_ok=True)
     
+    save_kwargs = _save_kwargs(quick)
+    
     # 1. Overall trend plot (PNG)
     if not monthly_overall_df.empty:
         overall_path = output_path / 'overall_trend.png'
-        plot_monthly(monthly_overall_df, 'Adverse Events Trend Over Time', overall_path)
+        plot_monthly(monthly_overall_df, 'Adverse Events Trend Over Time', overall_path, quick=quick)
+    
+    # One figure is reused for both bar charts
+    fig, ax = _new_figure((12, 8))
     
     # 2. Top 10 reactions bar chart
     if not monthly_reaction_df.empty:
@@ -608,7 +931,6 @@ def save_trend_plots(monthly_overall_df: pd.DataFrame,
         top_reactions = top_k(monthly_reaction_df, 'reaction_pt', top_n)
         
         if not top_reactions.empty:
-            fig, ax = plt.subplots(figsize=(12, 8))
             
             # Create horizontal bar chart
             y_pos = np.arange(len(top_reactions))
@@ -629,11 +951,8 @@ def save_trend_plots(monthly_overall_df: pd.DataFrame,
             # Invert y-axis to show highest values at top
             ax.invert_yaxis()
             
-            plt.tight_layout()
-            
             reactions_path = output_path / 'top_reactions_bar.png'
-            plt.savefig(reactions_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            fig.savefig(reactions_path, **save_kwargs)
             
             logger.info(f"Saved top reactions bar chart to {reactions_path}")
     
@@ -644,7 +963,7 @@ def save_trend_plots(monthly_overall_df: pd.DataFrame,
         top_drugs = top_k(monthly_drug_df, 'drug', top_n)
         
         if not top_drugs.empty:
-            fig, ax = plt.subplots(figsize=(12, 8))
+            ax.clear()
             
             # Create horizontal bar chart
             y_pos = np.arange(len(top_drugs))
@@ -668,11 +987,8 @@ def save_trend_plots(monthly_overall_df: pd.DataFrame,
             # Invert y-axis to show highest values at top
             ax.invert_yaxis()
             
-            plt.tight_layout()
-            
             drugs_path = output_path / 'top_drugs_bar.png'
-            plt.savefig(drugs_path, dpi=300, bbox_inches='tight')
-            plt.close()
+            fig.savefig(drugs_path, **save_kwargs)
             
             logger.info(f"Saved top drugs bar chart to {drugs_path}")
     
@@ -685,28 +1001,25 @@ if __name__ == "__main__":
     import pandas as pd
     from datetime import datetime, timedelta
     
-    # Generate sample events data
-    np.random.seed(42)
+    # Generate sample events data, one vectorized draw per column
+    rng = np.random.default_rng(42)
+    n_events = 1000
     
     dates = pd.date_range(start='2020-01-01', end='2023-12-31', freq='D')
-    sample_data = []
     
     reactions = ['HEADACHE', 'NAUSEA', 'DIZZINESS', 'FATIGUE', 'RASH']
     drugs = ['ASPIRIN', 'IBUPROFEN', 'ACETAMINOPHEN', 'METFORMIN', 'LISINOPRIL']
     
-    for _ in range(1000):
-        sample_data.append({
-            'event_date': np.random.choice(dates),
-            'case_id': f"CASE_{np.random.randint(1, 10000)}",
-            'drug': np.random.choice(drugs),
-            'reaction_pt': np.random.choice(reactions),
-            'sex': np.random.choice(['M', 'F', 'UNK']),
-            'age': np.random.randint(18, 80),
-            'country': 'US',
-            'serious': np.random.choice([True, False])
-        })
-    
-    sample_df = pd.DataFrame(sample_data)
+    sample_df = pd.DataFrame({
+        'event_date': rng.choice(dates.values, n_events),
+        'case_id': np.char.add('CASE_', rng.integers(1, 10000, n_events).astype(str)),
+        'drug': rng.choice(drugs, n_events),
+        'reaction_pt': rng.choice(reactions, n_events),
+        'sex': rng.choice(['M', 'F', 'UNK'], n_events),
+        'age': rng.integers(18, 80, n_events),
+        'country': 'US',
+        'serious': rng.choice([True, False], n_events)
+    })
     
     # Create aggregations
     monthly_overall_df, monthly_reaction_df, monthly_drug_df = create_all_aggregations(sample_df)
@@ -9,16 +9,86 @@ This module provides robust spike detection utilities using various methods:
 Methods handle missing data gracefully and provide consistent output schemas.
 """
 
+import hashlib
+import logging
+import os
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
 import pandas as pd
 import numpy as np
-from typing import Optional, Union
+from typing import Dict, Optional, Union
 import warnings
 from datetime import datetime
 
+# Import configuration - handle both relative and absolute imports
+try:
+    from ..config import ANALYSIS_CONFIG, CACHE_DIR
+    from ._kernels import get_rolling_z_kernel
+except ImportError:
+    # Fallback for direct execution
+    import sys
+    from pathlib import Path
+    sys.path.insert(0, str(Path(__file__).parent.parent))
+    from config import ANALYSIS_CONFIG, CACHE_DIR
+    from analysis._kernels import get_rolling_z_kernel
+
 # Suppress warnings for cleaner output
 warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", category=UserWarning)
 
+logger = logging.getLogger(__name__)
+
+# LRU cache of STL results keyed by series content and parameters; the LOESS
+# fit dominates dashboard refreshes and the same series are analyzed repeatedly
+STL_CACHE_MAX_ENTRIES = 256
+_STL_CACHE: "OrderedDict[tuple, pd.DataFrame]" = OrderedDict()
+
+# Fitted Prophet models serialized to JSON, one file per series, model
+# settings and Prophet version
+PROPHET_CACHE_DIR = CACHE_DIR / 'prophet'
+
+# Constructor settings of the Prophet model used for spike detection
+PROPHET_PARAMS = {
+    'yearly_seasonality': True,
+    'weekly_seasonality': False,
+    'daily_seasonality': False,
+    'seasonality_mode': 'additive'
+}
+
+
+@lru_cache(maxsize=None)
+def _get_stl():
+    """Import statsmodels' STL on first use (heavy import, scipy included)."""
+    from statsmodels.tsa.seasonal import STL
+    return STL
+
+
+@lru_cache(maxsize=None)
+def _get_prophet():
+    """Import Prophet on first use and quiet its logger."""
+    from prophet import Prophet
+    logging.getLogger('prophet').setLevel(logging.WARNING)
+    return Prophet
+
+
+def _as_datetime(values):
+    """
+    Return date values as datetimes, parsing only when they are not already.
+    
+    Datetime columns/indexes are passed through untouched. Strings are parsed
+    with the pipeline's ISO ``%Y-%m-%d`` format first, which takes pandas' fast
+    strptime path instead of per-element format inference; anything else
+    falls back to a generic ``pd.to_datetime``.
+    """
+    if pd.api.types.is_datetime64_any_dtype(values):
+        return values
+    try:
+        return pd.to_datetime(values, format='%Y-%m-%d', cache=True)
+    except (ValueError, TypeError):
+        return pd.to_datetime(values, cache=True)
+
 
 def ensure_monthly_index(df: pd.DataFrame, date_col: str, value_col: str) -> pd.Series:
     """
@@ -35,28 +105,78 @@ def ensure_monthly_index(df: pd.DataFrame, date_col: str, value_col: str) -> pd.
     if df.empty:
         return pd.Series(dtype=float, name=value_col)
     
-    # Convert date column to datetime and extract month start
-    df = df.copy()
-    df[date_col] = pd.to_datetime(df[date_col])
-    df['month_start'] = df[date_col].dt.to_period('M').dt.start_time
+    # Integer month offsets from the first month; one bincount sums each bucket
+    months = _as_datetime(df[date_col]).to_numpy(dtype='datetime64[M]')
+    valid = ~np.isnat(months)
+    if not valid.any():
+        return pd.Series(dtype=float, name=value_col)
     
-    # Group by month and sum values (in case of duplicates)
-    monthly_data = df.groupby('month_start')[value_col].sum()
+    months = months[valid]
+    first_month = months.min()
+    offsets = (months - first_month).astype(np.int64)
     
-    # Create continuous monthly range
-    if len(monthly_data) > 0:
-        full_range = pd.date_range(
-            start=monthly_data.index.min(),
-            end=monthly_data.index.max(),
-            freq='MS'  # Month start frequency
-        )
-        
-        # Reindex to fill missing months with 0
-        monthly_data = monthly_data.reindex(full_range, fill_value=0)
+    values = df[value_col].to_numpy()[valid]
+    weights = np.nan_to_num(np.asarray(values, dtype=np.float64))
+    totals = np.bincount(offsets, weights=weights)
+    if np.issubdtype(values.dtype, np.integer) or values.dtype == bool:
+        totals = totals.astype(np.int64)
+    
+    # Continuous monthly range; months without rows are already 0
+    full_range = pd.date_range(
+        start=first_month.astype('datetime64[ns]'),
+        periods=len(totals),
+        freq='MS'  # Month start frequency
+    )
+    monthly_data = pd.Series(totals, index=full_range, name=value_col)
     
     return monthly_data
 
 
+def _rolling_mean_std(values: np.ndarray, window: int):
+    """
+    Trailing rolling mean and sample std with ``min_periods=1`` semantics.
+    
+    Window sums, sums of squares and non-NaN counts come from cumulative sums,
+    so every statistic is a single vectorized pass instead of two pandas
+    Rolling passes. Values are centered first and variances within rounding
+    noise of the cumulative sums are snapped to 0, so flat windows still
+    report a std of exactly 0.
+    
+    Args:
+        values: float64 array (NaNs are skipped like pandas rolling does)
+        window: Rolling window size
+        
+    Returns:
+        Tuple of (mean, std) arrays; std is NaN where fewer than 2 values
+    """
+    n = len(values)
+    valid = ~np.isnan(values)
+    center = values[valid].mean() if valid.any() else 0.0
+    x = np.where(valid, values - center, 0.0)
+    
+    end = np.arange(1, n + 1)
+    start = np.maximum(end - window, 0)
+    
+    def window_sum(a):
+        c = np.concatenate(([0.0], np.cumsum(a)))
+        return c[end] - c[start], c
+    
+    count, _ = window_sum(valid.astype(np.float64))
+    total, _ = window_sum(x)
+    total_sq, cum_sq = window_sum(x * x)
+    
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = total / count
+        sq_dev = total_sq - count * mean * mean
+        # Differences of cumulative sums carry rounding error relative to the
+        # running sum of squares; anything below that is a flat window
+        sq_dev[sq_dev <= 1e3 * np.finfo(np.float64).eps * cum_sq[end]] = 0.0
+        std = np.sqrt(sq_dev / (count - 1))
+    std[count < 2] = np.nan
+    
+    return mean + center, std
+
+
 def rolling_zscore(series: pd.Series, window: int = 6, z_thresh: float = 2.0) -> pd.DataFrame:
     """
     Compute rolling Z-score anomaly detection.
@@ -72,40 +192,84 @@ def rolling_zscore(series: pd.Series, window: int = 6, z_thresh: float = 2.0) ->
     if series.empty or len(series) < window:
         return pd.DataFrame(columns=['value', 'mean', 'std', 'z', 'is_spike'])
     
-    # Compute rolling statistics
-    rolling_mean = series.rolling(window=window, min_periods=1).mean()
-    rolling_std = series.rolling(window=window, min_periods=1).std()
+    values = series.to_numpy(dtype=np.float64)
     
-    # Handle case where std is 0 (no variation)
-    rolling_std = rolling_std.fillna(0)
-    rolling_std = rolling_std.replace(0, np.nan)
-    
-    # Compute Z-scores
-    z_scores = (series - rolling_mean) / rolling_std
-    z_scores = z_scores.fillna(0)  # Fill NaN with 0 (no anomaly)
+    # Compiled on first use and memoized; None when Numba is not installed
+    kernel = get_rolling_z_kernel()
+    if kernel is not None:
+        rolling_mean, rolling_std, z_scores, is_spike = kernel(
+            values, window, float(z_thresh)
+        )
+    else:
+        rolling_mean, rolling_std = _rolling_mean_std(values, window)
+        
+        # Compute Z-scores; windows with no variation (std 0) are not anomalies
+        with np.errstate(invalid='ignore', divide='ignore'):
+            z_scores = (values - rolling_mean) / rolling_std
+        z_scores[~np.isfinite(z_scores)] = 0
+        
+        # Identify spikes
+        is_spike = np.abs(z_scores) > z_thresh
     
-    # Identify spikes
-    is_spike = np.abs(z_scores) > z_thresh
+    # Undefined std (single-value windows) is reported as 0, in place
+    rolling_std[np.isnan(rolling_std)] = 0
     
-    result = pd.DataFrame({
-        'value': series,
+    # Assemble once from the arrays; nothing is re-aligned or copied
+    return pd.DataFrame({
+        'value': series.to_numpy(),
         'mean': rolling_mean,
-        'std': rolling_std.fillna(0),
+        'std': rolling_std,
         'z': z_scores,
         'is_spike': is_spike
-    }, index=series.index)
-    
-    return result
+    }, index=series.index, copy=False)
+
+
+def _series_digest(series: pd.Series) -> str:
+    """Content hash of a series' values and index, used as a cache key."""
+    hashed = pd.util.hash_pandas_object(series, index=True).to_numpy()
+    return hashlib.blake2b(hashed.tobytes(), digest_size=16).hexdigest()
+
+
+def _stl_cache_key(series: pd.Series, period: int, z_thresh: float, robust: bool) -> tuple:
+    """Cache key for an STL result: series content plus parameters."""
+    return (_series_digest(series), period, float(z_thresh), bool(robust))
+
 
+def _stl_cache_get(key: tuple) -> Optional[pd.DataFrame]:
+    """Return a copy of a cached STL result (marking it recently used), or None."""
+    cached = _STL_CACHE.get(key)
+    if cached is None:
+        return None
+    _STL_CACHE.move_to_end(key)
+    return cached.copy()
 
-def stl_spikes(series: pd.Series, period: int = 12, z_thresh: float = 2.5) -> pd.DataFrame:
+
+def _stl_cache_put(key: tuple, result: pd.DataFrame) -> None:
+    """Store a copy of an STL result, evicting the least recently used entry."""
+    _STL_CACHE[key] = result.copy()
+    if len(_STL_CACHE) > STL_CACHE_MAX_ENTRIES:
+        _STL_CACHE.popitem(last=False)
+
+
+def stl_spikes(
+    series: pd.Series,
+    period: int = 12,
+    z_thresh: float = 2.5,
+    robust: bool = True
+) -> pd.DataFrame:
     """
     Compute STL decomposition-based anomaly detection.
     
+    Robust STL is the default: its outer reweighting loop keeps spikes out of
+    the trend and seasonal fits, so they stay in the residuals. A non-robust
+    fit is cheaper but lets large spikes leak into the seasonal component,
+    which can push them below the Z-score threshold.
+    
     Args:
         series: Time series data (should be indexed by dates)
         period: Seasonal period (default: 12 for monthly data)
         z_thresh: Z-score threshold for spike detection (default: 2.5)
+        robust: Use robust STL with outlier reweighting (default: True)
         
     Returns:
         DataFrame with columns [value, trend, seasonal, resid, z, is_spike]
@@ -113,11 +277,16 @@ def stl_spikes(series: pd.Series, period: int = 12, z_thresh: float = 2.5) -> pd
     if series.empty or len(series) < period * 2:
         return pd.DataFrame(columns=['value', 'trend', 'seasonal', 'resid', 'z', 'is_spike'])
     
+    cache_key = _stl_cache_key(series, period, z_thresh, robust)
+    cached = _stl_cache_get(cache_key)
+    if cached is not None:
+        return cached
+    
     try:
-        from statsmodels.tsa.seasonal import STL
+        STL = _get_stl()
         
         # Perform STL decomposition
-        stl = STL(series, period=period, robust=True)
+        stl = STL(series, period=period, robust=robust)
         decomposition = stl.fit()
         
         # Extract components
@@ -125,14 +294,15 @@ def stl_spikes(series: pd.Series, period: int = 12, z_thresh: float = 2.5) -> pd
         seasonal = decomposition.seasonal
         resid = decomposition.resid
         
-        # Compute Z-scores on residuals
-        resid_mean = resid.mean()
-        resid_std = resid.std()
+        # Compute Z-scores on residuals; float32 is ample for a threshold test
+        resid32 = resid.to_numpy(dtype=np.float32)
+        resid_mean = resid32.mean()
+        resid_std = resid32.std(ddof=1) if len(resid32) > 1 else np.nan
         
         if resid_std == 0 or np.isnan(resid_std):
-            z_scores = pd.Series(0, index=series.index)
+            z_scores = np.zeros(len(resid32), dtype=np.float32)
         else:
-            z_scores = (resid - resid_mean) / resid_std
+            z_scores = (resid32 - resid_mean) / resid_std
         
         # Identify spikes
         is_spike = np.abs(z_scores) > z_thresh
@@ -146,6 +316,8 @@ def stl_spikes(series: pd.Series, period: int = 12, z_thresh: float = 2.5) -> pd
             'is_spike': is_spike
         }, index=series.index)
         
+        _stl_cache_put(cache_key, result)
+        
         return result
         
     except ImportError:
@@ -158,6 +330,204 @@ def stl_spikes(series: pd.Series, period: int = 12, z_thresh: float = 2.5) -> pd
         return pd.DataFrame(columns=['value', 'trend', 'seasonal', 'resid', 'z', 'is_spike'])
 
 
+def monthly_series_by_key(
+    df: pd.DataFrame,
+    key_col: str,
+    date_col: str = 'ym',
+    value_col: str = 'count'
+) -> Dict[str, pd.Series]:
+    """
+    Build the continuous monthly series of every entity in one pass.
+    
+    Equivalent to calling ``ensure_monthly_index`` on each entity's rows, but
+    the long table is scattered into a dense (entity, month) matrix once with
+    a single bincount, and each series is a slice of it spanning that entity's
+    own first to last month.
+    
+    Args:
+        df: Long DataFrame with key, date and value columns
+        key_col: Entity column (e.g. 'drug' or 'reaction_pt')
+        date_col: Name of the date column
+        value_col: Name of the value column
+        
+    Returns:
+        Dictionary mapping each entity to its monthly Series
+    """
+    if df.empty:
+        return {}
+    
+    months = _as_datetime(df[date_col]).to_numpy(dtype='datetime64[M]')
+    keys = df[key_col].astype('category')
+    valid = ~np.isnat(months) & (keys.cat.codes.to_numpy() >= 0)
+    if not valid.any():
+        return {}
+    
+    months = months[valid]
+    codes = keys.cat.codes.to_numpy()[valid].astype(np.int64)
+    values = df[value_col].to_numpy()[valid]
+    
+    first_month = months.min()
+    offsets = (months - first_month).astype(np.int64)
+    n_keys = len(keys.cat.categories)
+    n_months = int(offsets.max()) + 1
+    
+    # Dense sums plus each entity's first/last month (its own series span)
+    flat = codes * n_months + offsets
+    totals = np.bincount(
+        flat,
+        weights=np.nan_to_num(np.asarray(values, dtype=np.float64)),
+        minlength=n_keys * n_months
+    ).reshape(n_keys, n_months)
+    if np.issubdtype(values.dtype, np.integer) or values.dtype == bool:
+        totals = totals.astype(np.int64)
+    
+    start = np.full(n_keys, n_months, dtype=np.int64)
+    end = np.full(n_keys, -1, dtype=np.int64)
+    np.minimum.at(start, codes, offsets)
+    np.maximum.at(end, codes, offsets)
+    
+    all_months = pd.date_range(
+        start=first_month.astype('datetime64[ns]'),
+        periods=n_months,
+        freq='MS'
+    )
+    
+    return {
+        key: pd.Series(
+            totals[code, start[code]:end[code] + 1],
+            index=all_months[start[code]:end[code] + 1],
+            name=value_col
+        )
+        for code, key in enumerate(keys.cat.categories)
+        if end[code] >= 0
+    }
+
+
+def batch_stl_spikes(
+    df: pd.DataFrame,
+    key_col: str = 'drug',
+    period: int = 12,
+    z_thresh: float = 2.5,
+    robust: bool = True,
+    n_jobs: int = 1
+) -> Dict[str, pd.DataFrame]:
+    """
+    Run STL spike detection for every drug/reaction of a monthly table.
+    
+    The per-entity series are built in one pass (``monthly_series_by_key``)
+    and cached results are reused. Remaining fits can be spread over worker
+    processes; statsmodels' STL holds the GIL, so threads would not help.
+    
+    Args:
+        df: Monthly by drug/reaction DataFrame with ym, key and count columns
+        key_col: Entity column (default: 'drug')
+        period: Seasonal period (default: 12 for monthly data)
+        z_thresh: Z-score threshold for spike detection (default: 2.5)
+        robust: Use robust STL (see ``stl_spikes``, default: True)
+        n_jobs: Number of worker processes (1 runs serially, -1 uses all CPUs)
+        
+    Returns:
+        Dictionary mapping each entity to its ``stl_spikes`` result
+    """
+    series_by_key = monthly_series_by_key(df, key_col)
+    
+    results = {}
+    pending = {}
+    for key, series in series_by_key.items():
+        cache_key = _stl_cache_key(series, period, z_thresh, robust)
+        cached = _stl_cache_get(cache_key)
+        if cached is not None:
+            results[key] = cached
+        else:
+            pending[key] = cache_key
+    
+    workers = (os.cpu_count() or 1) if n_jobs == -1 else max(1, n_jobs)
+    if workers == 1 or len(pending) < 2:
+        for key in pending:
+            results[key] = stl_spikes(
+                series_by_key[key], period=period, z_thresh=z_thresh, robust=robust
+            )
+        return results
+    
+    keys = list(pending)
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        fitted = executor.map(
+            stl_spikes,
+            [series_by_key[key] for key in keys],
+            [period] * len(keys),
+            [z_thresh] * len(keys),
+            [robust] * len(keys),
+            chunksize=16
+        )
+        for key, result in zip(keys, fitted):
+            if not result.empty:
+                _stl_cache_put(pending[key], result)
+            results[key] = result
+    
+    return results
+
+
+def _prophet_cache_path(series: pd.Series):
+    """
+    Cache file for a series' fitted Prophet model.
+    
+    The name covers the series content, the constructor settings and the
+    installed Prophet version, so changing either of the latter refits
+    instead of reusing a stale model.
+    """
+    import prophet
+    
+    settings = repr((sorted(PROPHET_PARAMS.items()), prophet.__version__))
+    digest = hashlib.blake2b(
+        f"{_series_digest(series)}|{settings}".encode('utf-8'), digest_size=16
+    ).hexdigest()
+    return PROPHET_CACHE_DIR / f"{digest}.json"
+
+
+def _load_prophet_model(series: pd.Series):
+    """
+    Return the cached fitted Prophet model for a series, or None.
+    
+    Models are stored with Prophet's own JSON serializer under
+    PROPHET_CACHE_DIR; a hit refreshes the file's mtime for LRU eviction.
+    """
+    if not ANALYSIS_CONFIG.get('prophet_model_cache', False):
+        return None
+    
+    path = _prophet_cache_path(series)
+    if not path.exists():
+        return None
+    
+    try:
+        from prophet.serialize import model_from_json
+        model = model_from_json(path.read_text(encoding='utf-8'))
+        os.utime(path)
+        return model
+    except Exception:
+        # Unreadable or incompatible (e.g. written by another Prophet version)
+        return None
+
+
+def _save_prophet_model(series: pd.Series, model) -> None:
+    """Store a fitted Prophet model and evict the least recently used ones."""
+    if not ANALYSIS_CONFIG.get('prophet_model_cache', False):
+        return
+    
+    try:
+        from prophet.serialize import model_to_json
+        PROPHET_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        path = _prophet_cache_path(series)
+        path.write_text(model_to_json(model), encoding='utf-8')
+        
+        max_models = ANALYSIS_CONFIG.get('prophet_cache_max_models', 64)
+        cached = sorted(PROPHET_CACHE_DIR.glob('*.json'), key=lambda p: p.stat().st_mtime)
+        for stale in cached[:max(0, len(cached) - max_models)]:
+            stale.unlink()
+    except Exception as e:
+        # Caching is best effort; the fitted model is still used for this call
+        logger.debug(f"Could not cache Prophet model: {e}")
+
+
 def prophet_spikes(series: pd.Series, z_thresh: float = 2.5) -> pd.DataFrame:
     """
     Compute Prophet-based anomaly detection (optional).
@@ -176,7 +546,7 @@ def prophet_spikes(series: pd.Series, z_thresh: float = 2.5) -> pd.DataFrame:
         return pd.DataFrame(columns=['value', 'trend', 'seasonal', 'resid', 'z', 'is_spike'])
     
     try:
-        from prophet import Prophet
+        Prophet = _get_prophet()
         
         # Prepare data for Prophet
         df_prophet = pd.DataFrame({
@@ -184,19 +554,13 @@ def prophet_spikes(series: pd.Series, z_thresh: float = 2.5) -> pd.DataFrame:
             'y': series.values
         })
         
-        # Fit Prophet model
-        model = Prophet(
-            yearly_seasonality=True,
-            weekly_seasonality=False,
-            daily_seasonality=False,
-            seasonality_mode='additive'
-        )
-        
-        # Suppress Prophet logging
-        import logging
-        logging.getLogger('prophet').setLevel(logging.WARNING)
-        
-        model.fit(df_prophet)
+        # Reuse a previously fitted model for identical data, otherwise fit
+        model = _load_prophet_model(series)
+        if model is None:
+            model = Prophet(**PROPHET_PARAMS)
+            
+            model.fit(df_prophet)
+            _save_prophet_model(series, model)
         
         # Make predictions
         forecast = model.predict(df_prophet)
@@ -258,18 +622,20 @@ def rank_spikes(df: pd.DataFrame, date_col: str, value_col: str, k: int = 3) ->
     if df.empty or 'is_spike' not in df.columns or 'z' not in df.columns:
         return pd.DataFrame(columns=['rank', 'date', 'value', 'z'])
     
-    # Filter to spikes only
-    spikes_df = df[df['is_spike']].copy()
+    # Filter to spikes only (read-only view, no copy needed)
+    spikes_df = df[df['is_spike'].to_numpy(dtype=bool)]
     
     if spikes_df.empty:
         return pd.DataFrame(columns=['rank', 'date', 'value', 'z'])
     
-    # Sort by absolute Z-score (descending)
-    spikes_df['abs_z'] = np.abs(spikes_df['z'])
-    spikes_df = spikes_df.sort_values('abs_z', ascending=False)
-    
-    # Take top k
-    top_spikes = spikes_df.head(k).copy()
+    # Top k by absolute Z-score: O(n) partition, then order just the winners
+    abs_z = np.abs(spikes_df['z'].to_numpy(dtype=np.float64))
+    if len(abs_z) > k:
+        top = np.argpartition(-abs_z, k)[:k]
+    else:
+        top = np.arange(len(abs_z))
+    top = top[np.argsort(-abs_z[top], kind='stable')]
+    top_spikes = spikes_df.iloc[top]
     
     # Prepare output
     if date_col and date_col in top_spikes.columns:
@@ -279,17 +645,24 @@ def rank_spikes(df: pd.DataFrame, date_col: str, value_col: str, k: int = 3) ->
     
     result = pd.DataFrame({
         'rank': range(1, len(top_spikes) + 1),
-        'date': dates,
+        'date': _as_datetime(dates),
         'value': top_spikes[value_col],
         'z': top_spikes['z']
     })
     
     # Format dates as strings for display
-    result['date'] = pd.to_datetime(result['date']).dt.strftime('%Y-%m-%d')
+    result['date'] = result['date'].dt.strftime('%Y-%m-%d')
     
     return result.reset_index(drop=True)
 
 
+def _rolling_zscore_fallback(series: pd.Series, kwargs: Dict) -> pd.DataFrame:
+    """Run rolling_zscore with only the keyword arguments it accepts."""
+    return rolling_zscore(
+        series, **{key: value for key, value in kwargs.items() if key in ('window', 'z_thresh')}
+    )
+
+
 def detect_anomalies(series: pd.Series, method: str = "stl", **kwargs) -> pd.DataFrame:
     """
     Unified anomaly detection interface with automatic fallbacks.
@@ -307,6 +680,13 @@ def detect_anomalies(series: pd.Series, method: str = "stl", **kwargs) -> pd.Dat
     
     method = method.lower()
     
+    # Too short for a seasonal fit: go straight to rolling Z-score instead of
+    # importing/fitting STL or Prophet only to get an empty result back
+    if method == "prophet" and len(series) < 24:
+        return _rolling_zscore_fallback(series, kwargs)
+    if method not in ("rolling_z", "prophet") and len(series) < 2 * kwargs.get('period', 12):
+        return _rolling_zscore_fallback(series, kwargs)
+    
     try:
         if method == "stl":
             return stl_spikes(series, **kwargs)
@@ -320,7 +700,7 @@ def detect_anomalies(series: pd.Series, method: str = "stl", **kwargs) -> pd.Dat
             
     except ImportError as e:
         # Fallback to rolling Z-score if library not available
-        return rolling_zscore(series, **kwargs)
+        return _rolling_zscore_fallback(series, kwargs)
     except Exception as e:
         # Fallback to rolling Z-score if method fails
-        return rolling_zscore(series, **kwargs)
+        return _rolling_zscore_fallback(series, kwargs)
@@ -5,81 +5,185 @@ This module provides high-level functions to summarize anomaly detection results
 and surface key insights about adverse event trends.
 """
 
+import logging
+import os
 import pandas as pd
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from pathlib import Path
 from typing import Dict, List, Optional, Union
 import warnings
 
-from .anomaly import ensure_monthly_index, detect_anomalies, rank_spikes
+from .anomaly import (
+    ensure_monthly_index, monthly_series_by_key, detect_anomalies, rank_spikes
+)
 
 # Suppress warnings for cleaner output
 warnings.filterwarnings("ignore", category=FutureWarning)
 warnings.filterwarnings("ignore", category=UserWarning)
 
+logger = logging.getLogger(__name__)
 
-def summarize_top_spikes_overall(
-    path: Union[str, Path] = "data/processed/monthly_counts.csv",
+
+def _table_source(path: Union[str, Path]) -> Path:
+    """
+    Pick the file to read for a monthly table.
+    
+    The pipeline writes a Parquet sibling (same stem, ``.parquet`` suffix) next
+    to each CSV; it is preferred when it is at least as new as the CSV.
+    """
+    path = Path(path)
+    parquet_path = path.with_suffix('.parquet')
+    if parquet_path.exists() and (
+        not path.exists() or parquet_path.stat().st_mtime >= path.stat().st_mtime
+    ):
+        return parquet_path
+    return path
+
+
+@lru_cache(maxsize=8)
+def _read_monthly_table(
+    source: str,
+    mtime: float,
+    key_col: Optional[str] = None
+) -> pd.DataFrame:
+    """
+    Read the ym/count (and optional key) columns of a monthly table.
+    
+    Cached per (file, mtime), so repeated summaries in an interactive session
+    reuse the parsed table and a rewrite by the pipeline invalidates it. The
+    returned frame is shared between callers and must not be modified.
+    """
+    columns = ['ym', 'count'] if key_col is None else ['ym', key_col, 'count']
+    if source.endswith('.parquet'):
+        return pd.read_parquet(source, columns=columns)
+    
+    # count is read as-is: blank cells parse to NaN and are handled downstream
+    # by ensure_monthly_index, where a fixed integer dtype would raise
+    dtype = {key_col: 'category'} if key_col is not None else None
+    return pd.read_csv(source, usecols=columns, dtype=dtype)
+
+
+@lru_cache(maxsize=8)
+def _entity_index(source: str, mtime: float, key_col: str) -> pd.DataFrame:
+    """
+    Index a cached by-drug/by-reaction table by its (categorical) key.
+    
+    Built once per (file, mtime): the rows are stably sorted by key so each
+    entity is one contiguous block, and a summary slices it with ``.loc``
+    instead of building a boolean mask over the whole table. Row order within
+    an entity (ym order) is preserved.
+    """
+    df = _read_monthly_table(source, mtime, key_col)
+    keys = df[key_col].astype('category')
+    return (
+        df[['ym', 'count']]
+        .set_index(pd.CategoricalIndex(keys, name=key_col))
+        .sort_index(kind='mergesort')
+    )
+
+
+def _load_monthly_table(path: Union[str, Path]) -> pd.DataFrame:
+    """Load the ym/count columns of a monthly table through the cache."""
+    source = _table_source(path)
+    return _read_monthly_table(str(source), source.stat().st_mtime)
+
+
+def _load_entity_rows(
+    path: Union[str, Path],
+    key_col: str,
+    key: str
+) -> Optional[pd.DataFrame]:
+    """
+    Load the ym/count rows of a single drug or reaction from a monthly table.
+    
+    Args:
+        path: Path to the monthly by drug/reaction CSV file
+        key_col: Entity column ('drug' or 'reaction_pt')
+        key: Entity value to select
+        
+    Returns:
+        DataFrame with ym and count columns for the entity (empty if the key
+        is absent), or None if the table itself is empty
+    """
+    source = _table_source(path)
+    mtime = source.stat().st_mtime
+    if _read_monthly_table(str(source), mtime, key_col).empty:
+        return None
+    
+    table = _entity_index(str(source), mtime, key_col)
+    if key in table.index.categories:
+        return table.loc[[key]].reset_index(drop=True)
+    return pd.DataFrame(columns=['ym', 'count'])
+
+
+# Summary dictionary key used for each entity column
+ENTITY_LABELS = {'drug': 'drug', 'reaction_pt': 'reaction'}
+
+
+def _summary(
+    method: str,
+    entity_col: Optional[str],
+    entity: Optional[str],
+    n_months: int,
+    note: str,
+    top_spikes: Optional[List[Dict]] = None
+) -> Dict:
+    """Build a summary dictionary, including the entity key for per-entity summaries."""
+    result = {"method": method}
+    if entity_col:
+        result[ENTITY_LABELS.get(entity_col, entity_col)] = entity if entity else None
+    result.update({
+        "n_months": n_months,
+        "top_spikes": top_spikes or [],
+        "note": note
+    })
+    return result
+
+
+def _summarize_series(
+    series: pd.Series,
+    entity_col: Optional[str] = None,
+    entity: Optional[str] = None,
     method: str = "stl",
     k: int = 3
 ) -> Dict:
     """
-    Summarize top spikes in overall adverse event counts.
+    Detect and rank spikes in a continuous monthly series.
     
     Args:
-        path: Path to monthly counts CSV file
+        series: Monthly series from ``ensure_monthly_index``
+        entity_col: Entity column ('drug' or 'reaction_pt'), None for overall counts
+        entity: Entity the series belongs to
         method: Anomaly detection method ("stl", "rolling_z", or "prophet")
         k: Number of top spikes to return
         
     Returns:
-        Dictionary with method, n_months, top_spikes list, and notes
+        Summary dictionary (see ``_summarize_top_spikes``)
     """
+    subject = f" for {entity}" if entity_col else ""
+    
     try:
-        # Load data
-        df = pd.read_csv(path)
-        
-        if df.empty or len(df) < 2:
-            return {
-                "method": method,
-                "n_months": 0,
-                "top_spikes": [],
-                "note": "Insufficient data available"
-            }
-        
-        # Ensure monthly index
-        series = ensure_monthly_index(df, 'ym', 'count')
-        
         if series.empty or len(series) < 2:
-            return {
-                "method": method,
-                "n_months": 0,
-                "top_spikes": [],
-                "note": "Insufficient data after processing"
-            }
+            return _summary(method, entity_col, entity, 0, "Insufficient data after processing")
         
         # Detect anomalies
         anomaly_df = detect_anomalies(series, method=method)
         
         if anomaly_df.empty:
-            return {
-                "method": method,
-                "n_months": len(series),
-                "top_spikes": [],
-                "note": f"No anomalies detected using {method} method"
-            }
+            return _summary(
+                method, entity_col, entity, len(series),
+                f"No anomalies detected{subject} using {method} method"
+            )
         
         # Rank spikes
         top_spikes_df = rank_spikes(anomaly_df, '', 'value', k=k)
         
-        # Convert to list of dictionaries
-        top_spikes = []
-        for _, row in top_spikes_df.iterrows():
-            top_spikes.append({
-                "rank": int(row['rank']),
-                "date": row['date'],
-                "value": int(row['value']),
-                "z": float(row['z'])
-            })
+        # Convert to list of dictionaries (to_dict boxes to native int/float/str)
+        top_spikes = top_spikes_df[['rank', 'date', 'value', 'z']].astype(
+            {'rank': 'int64', 'value': 'int64', 'z': 'float64'}
+        ).to_dict(orient='records')
         
         # Determine if fallback was used
         fallback_note = ""
@@ -88,20 +192,136 @@ def summarize_top_spikes_overall(
         elif method == "prophet" and len(series) < 24:
             fallback_note = "Fallback to rolling Z-score (insufficient data for Prophet)"
         
-        return {
-            "method": method,
-            "n_months": len(series),
-            "top_spikes": top_spikes,
-            "note": fallback_note if fallback_note else f"Anomaly detection using {method} method"
-        }
+        return _summary(
+            method, entity_col, entity, len(series),
+            fallback_note if fallback_note else f"Anomaly detection{subject} using {method} method",
+            top_spikes
+        )
         
     except Exception as e:
+        return _summary(method, entity_col, entity, 0, f"Error processing data{subject}: {str(e)}")
+
+
+def _summarize_top_spikes(
+    path: Union[str, Path],
+    entity_col: Optional[str] = None,
+    entity: Optional[str] = None,
+    method: str = "stl",
+    k: int = 3
+) -> Dict:
+    """
+    Shared implementation of the ``summarize_top_spikes_*`` functions.
+    
+    Loads the (cached) monthly table, selects the entity's rows if an entity
+    column is given, builds the monthly series, detects and ranks spikes.
+    
+    Args:
+        path: Path to the monthly CSV file
+        entity_col: Entity column ('drug' or 'reaction_pt'), None for overall counts
+        entity: Entity value to analyze (required when entity_col is set)
+        method: Anomaly detection method ("stl", "rolling_z", or "prophet")
+        k: Number of top spikes to return
+        
+    Returns:
+        Dictionary with method, the entity (if any), n_months, top_spikes list, and notes
+    """
+    label = ENTITY_LABELS.get(entity_col, entity_col)
+    subject = f" for {entity}" if entity_col else ""
+    
+    if entity_col and not entity:
+        return _summary(method, entity_col, entity, 0, f"No {label} specified")
+    
+    try:
+        # Load data (cached per file and modification time)
+        if entity_col:
+            entity_df = _load_entity_rows(path, entity_col, entity)
+            
+            if entity_df is None:
+                return _summary(method, entity_col, entity, 0, "No data available")
+            
+            if entity_df.empty:
+                return _summary(
+                    method, entity_col, entity, 0, f"No data found for {label}: {entity}"
+                )
+        else:
+            entity_df = _load_monthly_table(path)
+            
+            if entity_df.empty or len(entity_df) < 2:
+                return _summary(method, entity_col, entity, 0, "Insufficient data available")
+        
+        # Ensure monthly index
+        series = ensure_monthly_index(entity_df, 'ym', 'count')
+        
+    except Exception as e:
+        return _summary(method, entity_col, entity, 0, f"Error processing data{subject}: {str(e)}")
+    
+    return _summarize_series(series, entity_col, entity, method=method, k=k)
+
+
+def _summarize_all(
+    path: Union[str, Path],
+    entity_col: str,
+    method: str,
+    k: int,
+    n_jobs: int
+) -> Dict[str, Dict]:
+    """
+    Summarize top spikes for every entity of a by-drug/by-reaction table.
+    
+    The table is loaded once (through the cache) and every entity's monthly
+    series is built in one pass; the per-entity detection is then spread over
+    worker processes, since STL and Prophet fits are CPU-bound and hold the GIL.
+    If the table cannot be loaded, the error is logged and an empty mapping
+    is returned.
+    """
+    try:
+        # Load data (cached per file and modification time)
+        source = _table_source(path)
+        df = _read_monthly_table(str(source), source.stat().st_mtime, entity_col)
+        series_by_key = monthly_series_by_key(df, entity_col)
+    
+    except Exception as e:
+        logger.error(f"Error loading {path} for {entity_col} summaries: {e}")
+        return {}
+    
+    keys = list(series_by_key)
+    workers = (os.cpu_count() or 1) if n_jobs == -1 else max(1, n_jobs)
+    if workers == 1 or len(keys) < 2:
         return {
-            "method": method,
-            "n_months": 0,
-            "top_spikes": [],
-            "note": f"Error processing data: {str(e)}"
+            key: _summarize_series(series_by_key[key], entity_col, key, method=method, k=k)
+            for key in keys
         }
+    
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        summaries = executor.map(
+            _summarize_series,
+            [series_by_key[key] for key in keys],
+            [entity_col] * len(keys),
+            keys,
+            [method] * len(keys),
+            [k] * len(keys),
+            chunksize=max(1, len(keys) // (workers * 4))
+        )
+        return dict(zip(keys, summaries))
+
+
+def summarize_top_spikes_overall(
+    path: Union[str, Path] = "data/processed/monthly_counts.csv",
+    method: str = "stl",
+    k: int = 3
+) -> Dict:
+    """
+    Summarize top spikes in overall adverse event counts.
+    
+    Args:
+        path: Path to monthly counts CSV file
+        method: Anomaly detection method ("stl", "rolling_z", or "prophet")
+        k: Number of top spikes to return
+        
+    Returns:
+        Dictionary with method, n_months, top_spikes list, and notes
+    """
+    return _summarize_top_spikes(path, method=method, k=k)
 
 
 def summarize_top_spikes_by_drug(
@@ -122,100 +342,7 @@ def summarize_top_spikes_by_drug(
     Returns:
         Dictionary with method, drug, n_months, top_spikes list, and notes
     """
-    if not drug:
-        return {
-            "method": method,
-            "drug": None,
-            "n_months": 0,
-            "top_spikes": [],
-            "note": "No drug specified"
-        }
-    
-    try:
-        # Load data
-        df = pd.read_csv(path)
-        
-        if df.empty:
-            return {
-                "method": method,
-                "drug": drug,
-                "n_months": 0,
-                "top_spikes": [],
-                "note": "No data available"
-            }
-        
-        # Filter for specific drug
-        drug_df = df[df['drug'] == drug].copy()
-        
-        if drug_df.empty:
-            return {
-                "method": method,
-                "drug": drug,
-                "n_months": 0,
-                "top_spikes": [],
-                "note": f"No data found for drug: {drug}"
-            }
-        
-        # Ensure monthly index
-        series = ensure_monthly_index(drug_df, 'ym', 'count')
-        
-        if series.empty or len(series) < 2:
-            return {
-                "method": method,
-                "drug": drug,
-                "n_months": 0,
-                "top_spikes": [],
-                "note": "Insufficient data after processing"
-            }
-        
-        # Detect anomalies
-        anomaly_df = detect_anomalies(series, method=method)
-        
-        if anomaly_df.empty:
-            return {
-                "method": method,
-                "drug": drug,
-                "n_months": len(series),
-                "top_spikes": [],
-                "note": f"No anomalies detected for {drug} using {method} method"
-            }
-        
-        # Rank spikes
-        top_spikes_df = rank_spikes(anomaly_df, '', 'value', k=k)
-        
-        # Convert to list of dictionaries
-        top_spikes = []
-        for _, row in top_spikes_df.iterrows():
-            top_spikes.append({
-                "rank": int(row['rank']),
-                "date": row['date'],
-                "value": int(row['value']),
-                "z": float(row['z'])
-            })
-        
-        # Determine if fallback was used
-        fallback_note = ""
-        if method == "stl" and len(series) < 24:
-            fallback_note = "Fallback to rolling Z-score (insufficient data for STL)"
-        elif method == "prophet" and len(series) < 24:
-            fallback_note = "Fallback to rolling Z-score (insufficient data for Prophet)"
-        
-        return {
-            "method": method,
-            "drug": drug,
-            "n_months": len(series),
-            "top_spikes": top_spikes,
-            "note": fallback_note if fallback_note else f"Anomaly detection for {drug} using {method} method"
-        }
-        
-    except Exception as e:
-        return {
-            "method": method,
-            "drug": drug,
-            "n_months": 0,
-            "top_spikes": [],
-            "note": f"Error processing data for {drug}: {str(e)}"
-        }
+    return _summarize_top_spikes(path, 'drug', drug, method=method, k=k)
 
 
 def summarize_top_spikes_by_reaction(
@@ -236,100 +363,51 @@ def summarize_top_spikes_by_reaction(
     Returns:
         Dictionary with method, reaction, n_months, top_spikes list, and notes
     """
-    if not reaction:
-        return {
-            "method": method,
-            "reaction": None,
-            "n_months": 0,
-            "top_spikes": [],
-            "note": "No reaction specified"
-        }
+    return _summarize_top_spikes(path, 'reaction_pt', reaction, method=method, k=k)
+
+
+def summarize_all_drugs(
+    path: Union[str, Path] = "data/processed/monthly_by_drug.csv",
+    method: str = "stl",
+    k: int = 3,
+    n_jobs: int = 1
+) -> Dict[str, Dict]:
+    """
+    Summarize top spikes for every drug in the monthly by drug table.
     
-    try:
-        # Load data
-        df = pd.read_csv(path)
-        
-        if df.empty:
-            return {
-                "method": method,
-                "reaction": reaction,
-                "n_months": 0,
-                "top_spikes": [],
-                "note": "No data available"
-            }
-        
-        # Filter for specific reaction
-        reaction_df = df[df['reaction_pt'] == reaction].copy()
-        
-        if reaction_df.empty:
-            return {
-                "method": method,
-                "reaction": reaction,
-                "n_months": 0,
-                "top_spikes": [],
-                "note": f"No data found for reaction: {reaction}"
-            }
-        
-        # Ensure monthly index
-        series = ensure_monthly_index(reaction_df, 'ym', 'count')
-        
-        if series.empty or len(series) < 2:
-            return {
-                "method": method,
-                "reaction": reaction,
-                "n_months": 0,
-                "top_spikes": [],
-                "note": "Insufficient data after processing"
-            }
-        
-        # Detect anomalies
-        anomaly_df = detect_anomalies(series, method=method)
-        
-        if anomaly_df.empty:
-            return {
-                "method": method,
-                "reaction": reaction,
-                "n_months": len(series),
-                "top_spikes": [],
-                "note": f"No anomalies detected for {reaction} using {method} method"
-            }
-        
-        # Rank spikes
-        top_spikes_df = rank_spikes(anomaly_df, '', 'value', k=k)
-        
-        # Convert to list of dictionaries
-        top_spikes = []
-        for _, row in top_spikes_df.iterrows():
-            top_spikes.append({
-                "rank": int(row['rank']),
-                "date": row['date'],
-                "value": int(row['value']),
-                "z": float(row['z'])
-            })
-        
-        # Determine if fallback was used
-        fallback_note = ""
-        if method == "stl" and len(series) < 24:
-            fallback_note = "Fallback to rolling Z-score (insufficient data for STL)"
-        elif method == "prophet" and len(series) < 24:
-            fallback_note = "Fallback to rolling Z-score (insufficient data for Prophet)"
+    Args:
+        path: Path to monthly by drug CSV file
+        method: Anomaly detection method ("stl", "rolling_z", or "prophet")
+        k: Number of top spikes to return per drug
+        n_jobs: Number of worker processes (-1 uses all CPUs, 1 runs serially)
         
-        return {
-            "method": method,
-            "reaction": reaction,
-            "n_months": len(series),
-            "top_spikes": top_spikes,
-            "note": fallback_note if fallback_note else f"Anomaly detection for {reaction} using {method} method"
-        }
+    Returns:
+        Dictionary mapping each drug to its ``summarize_top_spikes_by_drug`` result
+        (empty if the table cannot be loaded)
+    """
+    return _summarize_all(path, 'drug', method, k, n_jobs)
+
+
+def summarize_all_reactions(
+    path: Union[str, Path] = "data/processed/monthly_by_reaction.csv",
+    method: str = "stl",
+    k: int = 3,
+    n_jobs: int = 1
+) -> Dict[str, Dict]:
+    """
+    Summarize top spikes for every reaction in the monthly by reaction table.
+    
+    Args:
+        path: Path to monthly by reaction CSV file
+        method: Anomaly detection method ("stl", "rolling_z", or "prophet")
+        k: Number of top spikes to return per reaction
+        n_jobs: Number of worker processes (-1 uses all CPUs, 1 runs serially)
         
-    except Exception as e:
-        return {
-            "method": method,
-            "reaction": reaction,
-            "n_months": 0,
-            "top_spikes": [],
-            "note": f"Error processing data for {reaction}: {str(e)}"
-        }
+    Returns:
+        Dictionary mapping each reaction to its ``summarize_top_spikes_by_reaction`` result
+        (empty if the table cannot be loaded)
+    """
+    return _summarize_all(path, 'reaction_pt', method, k, n_jobs)
 
 
 def get_spike_months(
@@ -5,12 +5,21 @@ This script provides a comprehensive quality assurance report for the processed
 including row counts, date ranges, top drugs/reactions, and data quality warnings.
 """
 
-import pandas as pd
+import csv
+import os
+from dataclasses import dataclass
 from pathlib import Path
 import sys
 from datetime import datetime
 
 
+# Status markers, padded to a fixed width
+_PASS, _FAIL = f"{'✓ PASS':<8}", f"{'✗ FAIL':<8}"
+
+# Line format for the top drugs/reactions listings
+_TOP_LINE = "  {:2d}. {:<30} ({:,} reports)".format
+
+
 def print_header(title):
     """Print a formatted header."""
     print(f"\n{'='*60}")
@@ -27,16 +36,118 @@ def print_section(title):
 
 def print_status(check_name, status, value=None):
     """Print a check status with pass/fail marker."""
-    marker = "✓ PASS" if status else "✗ FAIL"
+    marker = _PASS if status else _FAIL
     if value:
-        print(f"{marker:<8} {check_name}: {value}")
+        print(f"{marker} {check_name}: {value}")
     else:
-        print(f"{marker:<8} {check_name}")
+        print(f"{marker} {check_name}")
+
+
+def print_top_counts(top):
+    """Print a top-k value/count table as numbered lines with a single write."""
+    if top.num_rows:
+        # Column-wise conversion: two lists instead of a dict per row
+        lines = map(_TOP_LINE, range(1, top.num_rows + 1),
+                    top.column('value').to_pylist(), top.column('count').to_pylist())
+        sys.stdout.write('\n'.join(lines) + '\n')
+
+
+# Columns of the FAERS events table that the QA report inspects
+FAERS_QA_COLUMNS = ['event_date', 'drug', 'reaction_pt', 'sex']
+
+
+@dataclass(frozen=True)
+class FileInfo:
+    """Existence and size of a checked file."""
+    exists: bool
+    size: int
+
 
+def probe_files(directory, paths):
+    """
+    Look up existence and size of several files in one directory listing.
+    
+    The directory is scanned once and only the requested entries are
+    stat'ed (free on Windows, where scandir already carries the size).
+    Missing files, or a missing directory, give FileInfo(False, 0).
+    """
+    wanted = {path.name: path for path in paths}
+    info = {path: FileInfo(False, 0) for path in paths}
+    try:
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name in wanted:
+                    info[wanted[entry.name]] = FileInfo(True, entry.stat().st_size)
+    except (FileNotFoundError, NotADirectoryError):
+        pass
+    return info
 
-def check_file_exists(filepath):
-    """Check if file exists and return status."""
-    return filepath.exists()
+
+def footer_min_max(pf, column):
+    """
+    Get a column's min/max from Parquet row-group statistics.
+    
+    Folds the per-row-group min/max stored in the file footer, so no data
+    page is decoded. Returns (None, None) if the column is entirely null, or
+    None if any row group lacks usable statistics.
+    """
+    col_idx = pf.schema_arrow.get_field_index(column)
+    col_min = col_max = None
+    for rg in range(pf.metadata.num_row_groups):
+        row_group = pf.metadata.row_group(rg)
+        stats = row_group.column(col_idx).statistics
+        if stats is None:
+            return None
+        if not stats.has_min_max:
+            if stats.has_null_count and stats.null_count == row_group.num_rows:
+                continue  # all-null row group
+            return None
+        col_min = stats.min if col_min is None else min(col_min, stats.min)
+        col_max = stats.max if col_max is None else max(col_max, stats.max)
+    return col_min, col_max
+
+
+def top_value_counts(column, k=10):
+    """
+    Return the k most frequent non-null values of an Arrow column.
+    
+    The result is a small Arrow table with ``value`` and ``count`` columns,
+    most frequent first.
+    
+    Counts are computed with Arrow's hash kernel and the top k are selected
+    with a partial partition instead of sorting the whole histogram. Ties
+    keep first-appearance order, matching pandas' value_counts().head(k).
+    """
+    import numpy as np
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    
+    vc = pc.value_counts(column.dictionary_encode())
+    valid = vc.field('values').is_valid()
+    values = vc.field('values').filter(valid)
+    counts = vc.field('counts').filter(valid).to_numpy()
+    
+    if len(counts) > k:
+        kth = -np.partition(-counts, k - 1)[k - 1]
+        above = np.flatnonzero(counts > kth)
+        ties = np.flatnonzero(counts == kth)[:k - len(above)]
+        idx = np.sort(np.concatenate([above, ties]))
+    else:
+        idx = np.arange(len(counts))
+    idx = idx[np.argsort(-counts[idx], kind='stable')]
+    
+    names = values.take(pa.array(idx)).cast(values.type.value_type)
+    return pa.table({'value': names, 'count': pa.array(counts[idx])})
+
+
+def open_parquet_source(filepath):
+    """Open a file for Parquet reading, memory-mapped when the platform allows it."""
+    import pyarrow as pa
+    
+    try:
+        return pa.memory_map(str(filepath), 'r')
+    except (OSError, pa.ArrowException):
+        return pa.OSFile(str(filepath), 'r')
 
 
 def analyze_faers_data(filepath):
@@ -44,25 +155,40 @@ def analyze_faers_data(filepath):
     if not filepath.exists():
         return None
     
+    # Imported here so runs with no data skip the Arrow import entirely
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+    
     try:
-        df = pd.read_parquet(filepath)
-        
-        # Basic stats
-        total_rows = len(df)
-        date_range = None
-        if 'event_date' in df.columns and not df['event_date'].isnull().all():
-            min_date = df['event_date'].min()
-            max_date = df['event_date'].max()
-            date_range = f"{min_date.strftime('%Y-%m-%d')} to {max_date.strftime('%Y-%m-%d')}"
-        
-        # Top drugs and reactions
-        top_drugs = df['drug'].value_counts().head(10) if 'drug' in df.columns else None
-        top_reactions = df['reaction_pt'].value_counts().head(10) if 'reaction_pt' in df.columns else None
-        
-        # Data quality checks
-        missing_event_date_pct = (df['event_date'].isnull().sum() / total_rows * 100) if 'event_date' in df.columns else 0
-        missing_sex_pct = (df['sex'].isnull().sum() / total_rows * 100) if 'sex' in df.columns else 0
-        missing_reaction_pct = (df['reaction_pt'].isnull().sum() / total_rows * 100) if 'reaction_pt' in df.columns else 0
+        # Memory-map the file so pages already in the OS cache are read zero-copy
+        with open_parquet_source(filepath) as source:
+            # Decode only the inspected columns; the row count comes from the footer
+            pf = pq.ParquetFile(source)
+            columns = [col for col in FAERS_QA_COLUMNS if col in pf.schema_arrow.names]
+            table = pf.read(columns=columns, use_threads=True)
+            
+            # Basic stats
+            total_rows = pf.metadata.num_rows
+            date_range = None
+            if 'event_date' in columns:
+                extrema = footer_min_max(pf, 'event_date')
+                if extrema is None:
+                    # No usable footer statistics: fall back to the decoded column
+                    min_max = pc.min_max(table.column('event_date'))
+                    extrema = (min_max['min'].as_py(), min_max['max'].as_py())
+                min_date, max_date = extrema
+                if min_date is not None and max_date is not None:
+                    date_range = f"{min_date.strftime('%Y-%m-%d')} to {max_date.strftime('%Y-%m-%d')}"
+            
+            # Top drugs and reactions
+            top_drugs = top_value_counts(table.column('drug')) if 'drug' in columns else None
+            top_reactions = top_value_counts(table.column('reaction_pt')) if 'reaction_pt' in columns else None
+            
+            # Data quality checks (Arrow keeps a null count per array, no scan needed)
+            null_counts = {col: table.column(col).null_count for col in columns}
+            missing_event_date_pct = (null_counts['event_date'] / total_rows * 100) if 'event_date' in columns else 0
+            missing_sex_pct = (null_counts['sex'] / total_rows * 100) if 'sex' in columns else 0
+            missing_reaction_pct = (null_counts['reaction_pt'] / total_rows * 100) if 'reaction_pt' in columns else 0
         
         return {
             'total_rows': total_rows,
@@ -83,13 +209,52 @@ def analyze_monthly_data(filepath):
     if not filepath.exists():
         return None
     
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    from pyarrow import csv as pacsv
+    
     try:
-        df = pd.read_csv(filepath)
+        # The pipeline writes a Parquet sibling next to each CSV; when it is
+        # current, everything but the ym null count comes from its footer
+        parquet_path = filepath.with_suffix('.parquet')
+        if parquet_path.exists() and parquet_path.stat().st_mtime >= filepath.stat().st_mtime:
+            pf = pq.ParquetFile(parquet_path)
+            columns = pf.schema_arrow.names
+            has_ym = 'ym' in columns
+            return {
+                'total_rows': pf.metadata.num_rows,
+                'columns': columns,
+                'has_ym': has_ym,
+                'ym_null_count': pf.read(columns=['ym']).column('ym').null_count if has_ym else 0
+            }
+        
+        # Stream the file with Arrow, parsing only the ym column (or just the
+        # first column when ym is absent, to count rows)
+        with open(filepath, newline='', encoding='utf-8-sig', errors='replace') as f:
+            columns = next(csv.reader(f), [])
+        
+        has_ym = 'ym' in columns
+        reader = pacsv.open_csv(
+            filepath,
+            convert_options=pacsv.ConvertOptions(
+                include_columns=['ym'] if has_ym else columns[:1],
+                column_types={'ym': pa.string()},
+                strings_can_be_null=True
+            )
+        )
+        
+        total_rows = 0
+        ym_null_count = 0
+        for batch in reader:
+            total_rows += batch.num_rows
+            if has_ym:
+                ym_null_count += batch.column(0).null_count
+        
         return {
-            'total_rows': len(df),
-            'columns': list(df.columns),
-            'has_ym': 'ym' in df.columns,
-            'ym_null_count': df['ym'].isnull().sum() if 'ym' in df.columns else 0
+            'total_rows': total_rows,
+            'columns': columns,
+            'has_ym': has_ym,
+            'ym_null_count': ym_null_count
         }
     except Exception as e:
         print(f"Error analyzing {filepath.name}: {e}")
@@ -110,13 +275,22 @@ def run_smoke_checks():
     monthly_drug_file = data_dir / "monthly_by_drug.csv"
     reviews_file = data_dir / "review_events.csv"
     
-    # File existence checks
+    # File existence checks (one directory listing, reused by the summary)
+    file_info = probe_files(data_dir, [
+        faers_file, monthly_counts_file, monthly_reaction_file,
+        monthly_drug_file, reviews_file
+    ])
+    file_exists = {path: info.exists for path, info in file_info.items()}
+    
     print_section("FILE EXISTENCE CHECKS")
-    print_status("FAERS Events Data", check_file_exists(faers_file), str(faers_file))
-    print_status("Monthly Counts", check_file_exists(monthly_counts_file), str(monthly_counts_file))
-    print_status("Monthly by Reaction", check_file_exists(monthly_reaction_file), str(monthly_reaction_file))
-    print_status("Monthly by Drug", check_file_exists(monthly_drug_file), str(monthly_drug_file))
-    print_status("Review Events", check_file_exists(reviews_file), str(reviews_file))
+    print_status("FAERS Events Data", file_exists[faers_file], str(faers_file))
+    if file_exists[faers_file]:
+        faers_size = file_info[faers_file].size
+        print_status("FAERS Events Non-Empty", faers_size > 0, f"{faers_size:,} bytes")
+    print_status("Monthly Counts", file_exists[monthly_counts_file], str(monthly_counts_file))
+    print_status("Monthly by Reaction", file_exists[monthly_reaction_file], str(monthly_reaction_file))
+    print_status("Monthly by Drug", file_exists[monthly_drug_file], str(monthly_drug_file))
+    print_status("Review Events", file_exists[reviews_file], str(reviews_file))
     
     # FAERS data analysis
     print_section("FAERS DATA ANALYSIS")
@@ -130,15 +304,13 @@ def run_smoke_checks():
         
         print("\nTop 10 Drugs by Report Count:")
         if faers_stats['top_drugs'] is not None:
-            for i, (drug, count) in enumerate(faers_stats['top_drugs'].items(), 1):
-                print(f"  {i:2d}. {drug:<30} ({count:,} reports)")
+            print_top_counts(faers_stats['top_drugs'])
         else:
             print("  No drug data available")
         
         print("\nTop 10 Reactions by Report Count:")
         if faers_stats['top_reactions'] is not None:
-            for i, (reaction, count) in enumerate(faers_stats['top_reactions'].items(), 1):
-                print(f"  {i:2d}. {reaction:<30} ({count:,} reports)")
+            print_top_counts(faers_stats['top_reactions'])
         else:
             print("  No reaction data available")
     else:
@@ -189,10 +361,10 @@ def run_smoke_checks():
     
     # Count passed/failed checks
     all_files_exist = all([
-        check_file_exists(faers_file),
-        check_file_exists(monthly_counts_file),
-        check_file_exists(monthly_reaction_file),
-        check_file_exists(monthly_drug_file)
+        file_exists[faers_file],
+        file_exists[monthly_counts_file],
+        file_exists[monthly_reaction_file],
+        file_exists[monthly_drug_file]
     ])
     
     data_quality_ok = True
@@ -7,9 +7,9 @@ with filtering capabilities for drugs, reactions, and time periods.
 
 import streamlit as st
 import pandas as pd
-import plotly.express as px
 import plotly.graph_objects as go
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import numpy as np
 import os
@@ -25,6 +25,111 @@ from analysis.insights import (
     get_spike_months
 )
 from analysis.anomaly import ensure_monthly_index, detect_anomalies
+from analysis.aggregate import top_k
+
+
+# Dashboard CSS, emitted at the top of every run
+STYLE_BLOCK = """
+<style>
+.main-header {
+    background: linear-gradient(90deg, #1f77b4 0%, #2ca02c 50%, #ff7f0e 100%);
+    padding: 2rem;
+    border-radius: 10px;
+    margin-bottom: 2rem;
+    color: white;
+    text-align: center;
+}
+.main-title {
+    font-size: 3rem;
+    font-weight: bold;
+    margin-bottom: 0.5rem;
+}
+.main-subtitle {
+    font-size: 1.2rem;
+    opacity: 0.9;
+}
+.metric-container {
+    background-color: #f8f9fa;
+    padding: 1.5rem;
+    border-radius: 10px;
+    border-left: 4px solid #1f77b4;
+    margin: 0.5rem 0;
+}
+.stTabs [data-baseweb="tab-list"] {
+    gap: 2rem;
+}
+.stTabs [data-baseweb="tab"] {
+    height: 60px;
+    padding: 0px 24px;
+    background-color: #f0f2f6;
+    border-radius: 10px 10px 0px 0px;
+    font-weight: 600;
+}
+.stTabs [aria-selected="true"] {
+    background-color: #1f77b4;
+    color: white;
+}
+</style>
+"""
+
+
+# HTML card templates; each row of cards is laid out with flexbox and sent as
+# a single markdown message instead of one per st.columns cell
+FLEX_ROW_TEMPLATE = '<div style="display: flex; gap: 1rem;">{}</div>'
+
+KPI_CARD_TEMPLATE = (
+    '<div class="metric-container" style="flex: 1;">'
+    '<h3 style="color: {color}; margin: 0;">{title}</h3>'
+    '<h2 style="color: #333; margin: 0.5rem 0;{value_style}">{value}</h2>'
+    '<p style="color: #666; margin: 0; font-size: 0.9em;">{caption}</p>'
+    '</div>'
+)
+
+SOURCE_CARD_TEMPLATE = (
+    '<div style="flex: 1; background-color: {background}; padding: 15px; '
+    'border-radius: 10px; border-left: 4px solid {color};">'
+    '<h4 style="color: {color}; margin-top: 0;">{title}</h4>'
+    '<p><a href="{url}" target="_blank" style="text-decoration: none;">{link_text}</a></p>'
+    '<small>{caption}</small>'
+    '</div>'
+)
+
+DATA_SOURCES = (
+    {'background': '#f0f2f6', 'color': '#1f77b4', 'title': '🏛️ FDA FAERS',
+     'url': 'https://fis.fda.gov/extensions/FPD-QDE-FAERS/FPD-QDE-FAERS.html',
+     'link_text': 'FDA Adverse Event Reporting System (FAERS) Quarterly Data',
+     'caption': 'Official FDA adverse event reports'},
+    {'background': '#f0f8f0', 'color': '#2ca02c', 'title': '💊 WebMD Reviews',
+     'url': 'https://www.kaggle.com/datasets/rohanharode07/webmd-drug-reviews-dataset',
+     'link_text': 'WebMD Drug Reviews Dataset',
+     'caption': 'Patient-generated drug reviews'},
+    {'background': '#fff8f0', 'color': '#ff7f0e', 'title': '🎓 UCI ML Dataset',
+     'url': 'https://www.kaggle.com/datasets/jessicali9530/kuc-hackathon-winter-2018',
+     'link_text': 'UCI ML Drug Review dataset',
+     'caption': 'Drugs.com review dataset'},
+)
+
+DATA_SOURCES_HTML = FLEX_ROW_TEMPLATE.format(
+    ''.join(map(SOURCE_CARD_TEMPLATE.format_map, DATA_SOURCES))
+)
+
+CONTACT_HTML = FLEX_ROW_TEMPLATE.format(
+    '<div style="flex: 2; background-color: #f8f9fa; padding: 20px; border-radius: 10px; border: 1px solid #dee2e6;">'
+    '<h4 style="color: #495057; margin-top: 0;">📧 Mahin Das</h4>'
+    '<p style="margin: 5px 0;"><strong>Email:</strong> '
+    '<a href="mailto:mahinds04@gmail.com">mahinds04@gmail.com</a> | '
+    '<a href="mailto:dasmahin07@gmail.com">dasmahin07@gmail.com</a></p>'
+    '<p style="margin: 5px 0;"><strong>GitHub:</strong> '
+    '<a href="https://github.com/mahinds04" target="_blank">https://github.com/mahinds04</a></p>'
+    '<p style="margin: 5px 0; color: #6c757d;"><em>Adverse Event Trend Analyzer - Transforming drug safety data into actionable insights</em></p>'
+    '</div>'
+    '<div style="flex: 1; text-align: center; padding: 20px;">'
+    '<h4>⚡ Tech Stack</h4>'
+    '<p>🐍 Python | 📊 Streamlit</p>'
+    '<p>📈 Plotly | 🗃️ Pandas</p>'
+    '<p>🏥 FAERS | 🤖 NLP</p>'
+    '</div>'
+)
 
 
 # Check for sample mode
@@ -50,29 +155,98 @@ st.set_page_config(
 )
 
 
-@st.cache_data
-def load_data():
-    """Load all required data files with caching."""
-    sample_mode = is_sample_mode()
-    
+def get_data_paths(sample_mode):
+    """Return the monthly counts, by-reaction and by-drug CSV paths for the data mode."""
     if sample_mode:
         data_dir = Path("data/processed/_samples")
         file_suffix = ".sample"
-        st.info("🚀 **Demo Mode**: Using sample data (~50 rows) for instant preview")
     else:
         data_dir = Path("data/processed")
         file_suffix = ""
     
+    return [
+        data_dir / f"monthly_counts{file_suffix}.csv",
+        data_dir / f"monthly_by_reaction{file_suffix}.csv",
+        data_dir / f"monthly_by_drug{file_suffix}.csv"
+    ]
+
+
+def table_source(csv_path):
+    """
+    Return the file a monthly aggregation is read from.
+    
+    The ETL writes a typed ``.parquet`` file next to each CSV (ym already a
+    datetime column); it is preferred when at least as new as the CSV.
+    """
+    parquet_path = csv_path.with_suffix('.parquet')
+    if parquet_path.exists() and (
+        not csv_path.exists() or parquet_path.stat().st_mtime >= csv_path.stat().st_mtime
+    ):
+        return parquet_path
+    return csv_path
+
+
+def read_monthly_table(csv_path):
+    """
+    Read a monthly aggregation, preferring the pipeline's Parquet sibling.
+    
+    CSVs are parsed with pyarrow's multithreaded reader, which also types
+    ISO ``YYYY-MM-DD`` ym values as datetimes.
+    """
+    source = table_source(csv_path)
+    if source.suffix == '.parquet':
+        return pd.read_parquet(source)
+    return pd.read_csv(source, engine='pyarrow')
+
+
+def get_data_version(sample_mode):
+    """
+    Identify the loaded dataset by its source files and their modification times.
+    
+    Used as the cache key of the helpers that take the ``load_data`` frames as
+    unhashed arguments, so switching data mode or rewriting a file computes
+    fresh results instead of serving ones derived from the previous data.
+    """
+    version = []
+    for csv_path in get_data_paths(sample_mode):
+        source = table_source(csv_path)
+        version.append((str(source), source.stat().st_mtime if source.exists() else None))
+    return tuple(version)
+
+
+@st.cache_resource
+def load_data():
+    """
+    Load all required data files with caching.
+    
+    The frames are cached as shared objects (no per-rerun pickle copy), so
+    callers must treat them as read-only and filter into new frames.
+    """
+    sample_mode = is_sample_mode()
+    
+    if sample_mode:
+        st.info("🚀 **Demo Mode**: Using sample data (~50 rows) for instant preview")
+    
     try:
         # Load monthly aggregations
-        monthly_counts = pd.read_csv(data_dir / f"monthly_counts{file_suffix}.csv")
-        monthly_reaction = pd.read_csv(data_dir / f"monthly_by_reaction{file_suffix}.csv")
-        monthly_drug = pd.read_csv(data_dir / f"monthly_by_drug{file_suffix}.csv")
+        # The readers release the GIL, so the three files load concurrently
+        paths = get_data_paths(sample_mode)
+        with ThreadPoolExecutor(max_workers=len(paths)) as executor:
+            monthly_counts, monthly_reaction, monthly_drug = executor.map(read_monthly_table, paths)
         
-        # Convert ym to datetime for better plotting
+        # ym normally arrives typed; only YYYY-MM strings still need parsing
         for df in [monthly_counts, monthly_reaction, monthly_drug]:
             if 'ym' in df.columns:
-                df['date'] = pd.to_datetime(df['ym'], format='%Y-%m', errors='coerce')
+                if pd.api.types.is_datetime64_any_dtype(df['ym']):
+                    df['date'] = df['ym']
+                else:
+                    df['date'] = pd.to_datetime(df['ym'], format='%Y-%m', errors='coerce')
+        
+        # Dictionary-encode the entity columns so filters and groupbys work on codes
+        if 'drug' in monthly_drug.columns:
+            monthly_drug['drug'] = monthly_drug['drug'].astype('category')
+        if 'reaction_pt' in monthly_reaction.columns:
+            monthly_reaction['reaction_pt'] = monthly_reaction['reaction_pt'].astype('category')
         
         return monthly_counts, monthly_reaction, monthly_drug
     
@@ -100,17 +274,15 @@ def calculate_kpis(monthly_counts, monthly_reaction, monthly_drug):
         unique_drugs = len(monthly_drug['drug'].unique()) if 'drug' in monthly_drug.columns else 0
         unique_reactions = len(monthly_reaction['reaction_pt'].unique()) if 'reaction_pt' in monthly_reaction.columns else 0
         
-        # Date coverage
-        all_dates = []
-        for df in [monthly_counts, monthly_reaction, monthly_drug]:
-            if 'date' in df.columns:
-                valid_dates = df['date'].dropna()
-                if len(valid_dates) > 0:
-                    all_dates.extend(valid_dates)
+        # Date coverage, reduced over the raw datetime64 buffers
+        date_arrays = [df['date'].to_numpy() for df in [monthly_counts, monthly_reaction, monthly_drug]
+                       if 'date' in df.columns]
+        all_dates = np.concatenate(date_arrays) if date_arrays else np.array([], dtype='datetime64[ns]')
+        all_dates = all_dates[~np.isnat(all_dates)]
         
-        if all_dates:
-            min_date = min(all_dates)
-            max_date = max(all_dates)
+        if len(all_dates) > 0:
+            min_date = pd.Timestamp(all_dates.min())
+            max_date = pd.Timestamp(all_dates.max())
             date_range = f"{min_date.strftime('%Y-%m')} to {max_date.strftime('%Y-%m')}"
         else:
             date_range = "No valid dates"
@@ -122,6 +294,115 @@ def calculate_kpis(monthly_counts, monthly_reaction, monthly_drug):
         return 0, 0, 0, "Error"
 
 
+@st.cache_resource
+def load_filter_options(data_version, _monthly_counts, _monthly_reaction, _monthly_drug):
+    """
+    Compute the sidebar options and KPI values once per loaded dataset.
+    
+    Both depend only on the cached frames from ``load_data``, not on widget
+    state, so caching them avoids re-running the unique/sort passes over the
+    drug and reaction columns on every rerun. The frames are the shared
+    ``load_data`` singletons, so they are excluded from the cache key
+    (underscore names) rather than hashed on every call; ``data_version``
+    (from ``get_data_version``) keys the cache to the dataset they came from.
+    """
+    monthly_counts, monthly_reaction, monthly_drug = _monthly_counts, _monthly_reaction, _monthly_drug
+    
+    # The entity columns are categorical, so their categories are already the
+    # deduplicated values; only that short index needs sorting
+    drug_options = ["<ALL>"] + monthly_drug['drug'].cat.categories.sort_values().tolist() if 'drug' in monthly_drug.columns else ["<ALL>"]
+    reaction_options = ["<ALL>"] + monthly_reaction['reaction_pt'].cat.categories.sort_values().tolist() if 'reaction_pt' in monthly_reaction.columns else ["<ALL>"]
+    
+    # Per-row years (0 for missing dates) so the year filter is one int16 compare
+    year_index = [
+        df['date'].dt.year.fillna(0).to_numpy(dtype=np.int16) if 'date' in df.columns else None
+        for df in [monthly_counts, monthly_reaction, monthly_drug]
+    ]
+    
+    # np.unique sorts and deduplicates the years in one pass; 0 marks missing dates
+    known_years = [y for y in year_index if y is not None]
+    years = np.unique(np.concatenate(known_years)) if known_years else np.empty(0, dtype=np.int16)
+    year_options = ["<ALL>"] + years[years != 0].tolist()
+    
+    return {
+        'drugs': drug_options,
+        'reactions': reaction_options,
+        'years': year_options,
+        'year_index': year_index,
+        'kpis': calculate_kpis(monthly_counts, monthly_reaction, monthly_drug)
+    }
+
+
+@st.cache_resource
+def load_top_totals(data_version, _data, key_col, year, k=10):
+    """
+    Rank the top-k entities by total reports for one year filter.
+    
+    ``_data`` is the unfiltered ``load_data`` frame for ``key_col`` (excluded
+    from the cache key, with ``data_version`` standing in for it), so each
+    (column, year) ranking is computed once per dataset and later reruns are
+    a dictionary lookup.
+    """
+    data = _data
+    if year != "<ALL>" and 'date' in data.columns:
+        data = data[data['date'].dt.year == year]
+    return top_k(data, key_col, k)
+
+
+def gradient_css(values, cmap):
+    """
+    Build background-gradient cell styles for one table column.
+    
+    Matches ``Styler.background_gradient`` (min-max normalisation, light text
+    on dark cells) but maps the colormap, luminance and hex colors in single
+    NumPy passes instead of per-cell matplotlib conversions.
+    
+    Args:
+        values: Column values to color
+        cmap: Matplotlib colormap name
+        
+    Returns:
+        List of CSS declarations, one per value
+    """
+    from matplotlib import colormaps
+    
+    values = np.asarray(values, dtype=float)
+    vmin, vmax = np.nanmin(values), np.nanmax(values)
+    norm = (values - vmin) / (vmax - vmin) if vmax > vmin else np.zeros_like(values)
+    rgb = colormaps[cmap](norm)[:, :3]
+    
+    # W3C relative luminance decides between light and dark text
+    linear = np.where(rgb <= 0.04045, rgb / 12.92, ((rgb + 0.055) / 1.055) ** 2.4)
+    dark = linear @ np.array([0.2126, 0.7152, 0.0722]) < 0.408
+    
+    rgb8 = np.round(rgb * 255).astype(np.int64)
+    hex_colors = np.char.mod('#%06x', (rgb8[:, 0] << 16) | (rgb8[:, 1] << 8) | rgb8[:, 2])
+    text_colors = np.where(dark, '#f1f1f1', '#000000')
+    return [f"background-color: {bg};color: {fg};" for bg, fg in zip(hex_colors, text_colors)]
+
+
+def create_trend_figure(df, value_col, title):
+    """
+    Create the base monthly trend line as a WebGL trace.
+    
+    ``go.Scattergl`` is rasterized on the GPU, so dense series with many
+    months render far faster than the SVG traces ``px.line`` produces.
+    """
+    fig = go.Figure(
+        go.Scattergl(
+            x=df['date'],
+            y=df[value_col],
+            mode='lines',
+            name='Number of Reports',
+            showlegend=False,
+            hovertemplate='Month=%{x}<br>Number of Reports=%{y}<extra></extra>'
+        )
+    )
+    fig.update_layout(title=title)
+    
+    return fig
+
+
 def create_overall_trend_chart(monthly_counts, method="stl"):
     """Create overall monthly trend chart with spike detection overlay."""
     if 'date' not in monthly_counts.columns or 'count' not in monthly_counts.columns:
@@ -136,14 +417,7 @@ def create_overall_trend_chart(monthly_counts, method="stl"):
         return None
     
     # Create base line chart
-    fig = px.line(
-        df_clean,
-        x='date',
-        y='count',
-        title='Overall Monthly Adverse Event Reports',
-        labels={'count': 'Number of Reports', 'date': 'Month'},
-        line_shape='spline'
-    )
+    fig = create_trend_figure(df_clean, 'count', 'Overall Monthly Adverse Event Reports')
     
     # Add spike detection overlay
     try:
@@ -222,14 +496,7 @@ def create_filtered_trend_chart(data, filter_type, filter_value, value_col='coun
         return None
     
     # Create base line chart
-    fig = px.line(
-        df_clean,
-        x='date',
-        y=value_col,
-        title=title,
-        labels={value_col: 'Number of Reports', 'date': 'Month'},
-        line_shape='spline'
-    )
+    fig = create_trend_figure(df_clean, value_col, title)
     
     # Add spike detection overlay
     try:
@@ -272,81 +539,33 @@ def create_filtered_trend_chart(data, filter_type, filter_value, value_col='coun
     )
     
     return fig
-    
-    # Remove rows with null dates
-    df_agg = df_agg.dropna(subset=['date'])
-    
-    if len(df_agg) == 0:
-        st.warning("No valid data for filtered trend chart")
-        return None
-    
-    fig = px.line(
-        df_agg,
-        x='date',
-        y=value_col,
-        title=title,
-        labels={value_col: 'Number of Reports', 'date': 'Month'},
-        line_shape='spline'
-    )
-    
-    fig.update_layout(
-        xaxis_title="Month",
-        yaxis_title="Number of Reports",
-        hovermode='x unified'
-    )
-    
-    return fig
+
+
+def create_tabs(labels):
+    """
+    Create the main tabs, tracking the selected one where Streamlit supports it.
+    
+    With ``on_change="rerun"`` each tab's ``.open`` reports whether it is the
+    selected tab, so hidden tabs can skip their charts and tables. Streamlit
+    versions without the parameter fall back to plain tabs, whose bodies all
+    run as before.
+    """
+    try:
+        return st.tabs(labels, key="main_tabs", on_change="rerun")
+    except TypeError:
+        return st.tabs(labels)
+
+
+def tab_is_open(tab):
+    """Return False only for a tab known to be hidden (unknown counts as open)."""
+    return getattr(tab, 'open', None) is not False
 
 
 def main():
     """Main dashboard application."""
     
     # Enhanced Header with custom styling
-    st.markdown(
-        """
-        <style>
-        .main-header {
-            background: linear-gradient(90deg, #1f77b4 0%, #2ca02c 50%, #ff7f0e 100%);
-            padding: 2rem;
-            border-radius: 10px;
-            margin-bottom: 2rem;
-            color: white;
-            text-align: center;
-        }
-        .main-title {
-            font-size: 3rem;
-            font-weight: bold;
-            margin-bottom: 0.5rem;
-        }
-        .main-subtitle {
-            font-size: 1.2rem;
-            opacity: 0.9;
-        }
-        .metric-container {
-            background-color: #f8f9fa;
-            padding: 1.5rem;
-            border-radius: 10px;
-            border-left: 4px solid #1f77b4;
-            margin: 0.5rem 0;
-        }
-        .stTabs [data-baseweb="tab-list"] {
-            gap: 2rem;
-        }
-        .stTabs [data-baseweb="tab"] {
-            height: 60px;
-            padding: 0px 24px;
-            background-color: #f0f2f6;
-            border-radius: 10px 10px 0px 0px;
-            font-weight: 600;
-        }
-        .stTabs [aria-selected="true"] {
-            background-color: #1f77b4;
-            color: white;
-        }
-        </style>
-        """,
-        unsafe_allow_html=True
-    )
+    st.markdown(STYLE_BLOCK, unsafe_allow_html=True)
     
     st.markdown(
         """
@@ -361,64 +580,30 @@ def main():
     # Add a loading animation while data loads
     with st.spinner("🔄 Loading pharmaceutical safety data..."):
         monthly_counts, monthly_reaction, monthly_drug = load_data()
+        data_version = get_data_version(is_sample_mode())
+        filter_options = load_filter_options(data_version, monthly_counts, monthly_reaction, monthly_drug)
     
     # Calculate KPIs
-    total_reports, unique_drugs, unique_reactions, date_range = calculate_kpis(
-        monthly_counts, monthly_reaction, monthly_drug
-    )
+    total_reports, unique_drugs, unique_reactions, date_range = filter_options['kpis']
     
     # Enhanced KPI Metrics Row
     st.markdown("## 📈 Key Performance Indicators")
     
-    col1, col2, col3, col4 = st.columns(4)
-    
-    with col1:
-        st.markdown(
-            f"""
-            <div class="metric-container">
-                <h3 style="color: #1f77b4; margin: 0;">📊 Total AE Reports</h3>
-                <h2 style="color: #333; margin: 0.5rem 0;">{total_reports:,}</h2>
-                <p style="color: #666; margin: 0; font-size: 0.9em;">Adverse event records</p>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-    
-    with col2:
-        st.markdown(
-            f"""
-            <div class="metric-container">
-                <h3 style="color: #2ca02c; margin: 0;">💊 Unique Drugs</h3>
-                <h2 style="color: #333; margin: 0.5rem 0;">{unique_drugs:,}</h2>
-                <p style="color: #666; margin: 0; font-size: 0.9em;">Different medications</p>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-    
-    with col3:
-        st.markdown(
-            f"""
-            <div class="metric-container">
-                <h3 style="color: #ff7f0e; margin: 0;">⚠️ Unique Reactions</h3>
-                <h2 style="color: #333; margin: 0.5rem 0;">{unique_reactions:,}</h2>
-                <p style="color: #666; margin: 0; font-size: 0.9em;">Adverse event types</p>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-    
-    with col4:
-        st.markdown(
-            f"""
-            <div class="metric-container">
-                <h3 style="color: #d62728; margin: 0;">📅 Date Coverage</h3>
-                <h2 style="color: #333; margin: 0.5rem 0; font-size: 1.5rem;">{date_range}</h2>
-                <p style="color: #666; margin: 0; font-size: 0.9em;">Data timespan</p>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+    kpi_values = (
+        {'color': '#1f77b4', 'title': '📊 Total AE Reports', 'value': f"{total_reports:,}",
+         'value_style': '', 'caption': 'Adverse event records'},
+        {'color': '#2ca02c', 'title': '💊 Unique Drugs', 'value': f"{unique_drugs:,}",
+         'value_style': '', 'caption': 'Different medications'},
+        {'color': '#ff7f0e', 'title': '⚠️ Unique Reactions', 'value': f"{unique_reactions:,}",
+         'value_style': '', 'caption': 'Adverse event types'},
+        {'color': '#d62728', 'title': '📅 Date Coverage', 'value': date_range,
+         'value_style': ' font-size: 1.5rem;', 'caption': 'Data timespan'},
+    )
+    # One markdown message for the whole row instead of one per column
+    st.markdown(
+        FLEX_ROW_TEMPLATE.format(''.join(map(KPI_CARD_TEMPLATE.format_map, kpi_values))),
+        unsafe_allow_html=True
+    )
     
     # Enhanced Sidebar Filters
     st.sidebar.markdown(
@@ -460,24 +645,15 @@ def main():
     
     st.sidebar.markdown("### 💊 Drug Selection")
     # Drug filter
-    drug_options = ["<ALL>"] + sorted(monthly_drug['drug'].unique().tolist()) if 'drug' in monthly_drug.columns else ["<ALL>"]
-    selected_drug = st.sidebar.selectbox("Choose a drug:", drug_options)
+    selected_drug = st.sidebar.selectbox("Choose a drug:", filter_options['drugs'])
     
     st.sidebar.markdown("### ⚠️ Reaction Selection")
     # Reaction filter
-    reaction_options = ["<ALL>"] + sorted(monthly_reaction['reaction_pt'].unique().tolist()) if 'reaction_pt' in monthly_reaction.columns else ["<ALL>"]
-    selected_reaction = st.sidebar.selectbox("Choose a reaction:", reaction_options)
+    selected_reaction = st.sidebar.selectbox("Choose a reaction:", filter_options['reactions'])
     
     st.sidebar.markdown("### 📅 Time Period")
     # Year filter
-    all_years = set()
-    for df in [monthly_counts, monthly_reaction, monthly_drug]:
-        if 'date' in df.columns:
-            years = df['date'].dt.year.dropna().unique()
-            all_years.update(years)
-    
-    year_options = ["<ALL>"] + sorted([int(year) for year in all_years if not pd.isna(year)])
-    selected_year = st.sidebar.selectbox("Choose a year:", year_options)
+    selected_year = st.sidebar.selectbox("Choose a year:", filter_options['years'])
     
     # Add data summary in sidebar
     st.sidebar.markdown("---")
@@ -485,8 +661,8 @@ def main():
     if 'drug' in monthly_drug.columns and 'reaction_pt' in monthly_reaction.columns:
         st.sidebar.info(f"""
         **Available Data:**
-        - 🏥 {len(monthly_drug['drug'].unique())} unique drugs
-        - ⚠️ {len(monthly_reaction['reaction_pt'].unique())} unique reactions
+        - 🏥 {unique_drugs} unique drugs
+        - ⚠️ {unique_reactions} unique reactions
         - 📅 {len(monthly_counts)} monthly periods
         """)
     
@@ -508,11 +684,15 @@ def main():
             mime="text/csv"
         )
     
+    # Top-10 tables are cached per year on the unfiltered frames
+    all_reaction, all_drug = monthly_reaction, monthly_drug
+    
     # Apply year filter to all datasets
     if selected_year != "<ALL>":
-        monthly_counts = monthly_counts[monthly_counts['date'].dt.year == selected_year] if 'date' in monthly_counts.columns else monthly_counts
-        monthly_reaction = monthly_reaction[monthly_reaction['date'].dt.year == selected_year] if 'date' in monthly_reaction.columns else monthly_reaction
-        monthly_drug = monthly_drug[monthly_drug['date'].dt.year == selected_year] if 'date' in monthly_drug.columns else monthly_drug
+        counts_years, reaction_years, drug_years = filter_options['year_index']
+        monthly_counts = monthly_counts[counts_years == selected_year] if counts_years is not None else monthly_counts
+        monthly_reaction = monthly_reaction[reaction_years == selected_year] if reaction_years is not None else monthly_reaction
+        monthly_drug = monthly_drug[drug_years == selected_year] if drug_years is not None else monthly_drug
     
     # Enhanced Main Content Area
     st.markdown("## 📊 Trend Analysis & Insights")
@@ -622,7 +802,7 @@ def main():
                 st.info("Select a specific reaction to see insights")
     
     # Create enhanced tabs with icons
-    tab1, tab2, tab3, tab4 = st.tabs([
+    tab1, tab2, tab3, tab4 = create_tabs([
         "🌍 Overall Trends", 
         "💊 Drug Analysis", 
         "⚠️ Reaction Analysis", 
@@ -630,123 +810,129 @@ def main():
     ])
     
     with tab1:
-        st.markdown("### 🌍 Overall Monthly Adverse Event Reports")
-        st.markdown("*Comprehensive view of all adverse event reports over time*")
-        
-        fig_overall = create_overall_trend_chart(monthly_counts, method=selected_method_key)
-        if fig_overall:
-            st.plotly_chart(fig_overall, use_container_width=True)
+        if tab_is_open(tab1):
+            st.markdown("### 🌍 Overall Monthly Adverse Event Reports")
+            st.markdown("*Comprehensive view of all adverse event reports over time*")
             
-            # Add insights
-            if not monthly_counts.empty and 'count' in monthly_counts.columns:
-                total_reports_filtered = monthly_counts['count'].sum()
-                avg_monthly = monthly_counts['count'].mean()
-                max_month = monthly_counts.loc[monthly_counts['count'].idxmax(), 'date'].strftime('%Y-%m') if 'date' in monthly_counts.columns else "N/A"
+            fig_overall = create_overall_trend_chart(monthly_counts, method=selected_method_key)
+            if fig_overall:
+                st.plotly_chart(fig_overall, use_container_width=True)
                 
-                col1, col2, col3 = st.columns(3)
-                with col1:
-                    st.metric("📊 Total Reports", f"{total_reports_filtered:,}")
-                with col2:
-                    st.metric("📈 Monthly Average", f"{avg_monthly:,.0f}")
-                with col3:
-                    st.metric("🔥 Peak Month", max_month)
-        else:
-            st.error("❌ Unable to create overall trend chart")
+                # Add insights
+                if not monthly_counts.empty and 'count' in monthly_counts.columns:
+                    total_reports_filtered = monthly_counts['count'].sum()
+                    avg_monthly = monthly_counts['count'].mean()
+                    max_month = monthly_counts.loc[monthly_counts['count'].idxmax(), 'date'].strftime('%Y-%m') if 'date' in monthly_counts.columns else "N/A"
+                    
+                    col1, col2, col3 = st.columns(3)
+                    with col1:
+                        st.metric("📊 Total Reports", f"{total_reports_filtered:,}")
+                    with col2:
+                        st.metric("📈 Monthly Average", f"{avg_monthly:,.0f}")
+                    with col3:
+                        st.metric("🔥 Peak Month", max_month)
+            else:
+                st.error("❌ Unable to create overall trend chart")
     
     with tab2:
-        st.markdown("### 💊 Drug-Specific Trends")
-        if selected_drug != "<ALL>":
-            st.markdown(f"*Analyzing adverse events for: **{selected_drug}***")
-        else:
-            st.markdown("*Comprehensive drug analysis across all medications*")
-        
-        fig_drug = create_filtered_trend_chart(monthly_drug, "drug", selected_drug, method=selected_method_key)
-        if fig_drug:
-            st.plotly_chart(fig_drug, use_container_width=True)
-        else:
-            st.error("❌ Unable to create drug trend chart")
-        
-        # Enhanced top drugs table
-        if 'drug' in monthly_drug.columns and 'count' in monthly_drug.columns:
-            st.markdown("### 🏆 Top 10 Drugs by Total Reports")
-            top_drugs = monthly_drug.groupby('drug')['count'].sum().sort_values(ascending=False).head(10)
-            top_drugs_df = pd.DataFrame({
-                'Rank': range(1, len(top_drugs) + 1),
-                'Drug Name': top_drugs.index,
-                'Total Reports': top_drugs.values,
-                'Percentage': [(count/top_drugs.sum()*100) for count in top_drugs.values]
-            })
+        if tab_is_open(tab2):
+            st.markdown("### 💊 Drug-Specific Trends")
+            if selected_drug != "<ALL>":
+                st.markdown(f"*Analyzing adverse events for: **{selected_drug}***")
+            else:
+                st.markdown("*Comprehensive drug analysis across all medications*")
             
-            # Color-code the table
-            styled_df = top_drugs_df.style.format({
-                'Total Reports': '{:,}',
-                'Percentage': '{:.1f}%'
-            }).background_gradient(subset=['Total Reports'], cmap='Blues')
+            fig_drug = create_filtered_trend_chart(monthly_drug, "drug", selected_drug, method=selected_method_key)
+            if fig_drug:
+                st.plotly_chart(fig_drug, use_container_width=True)
+            else:
+                st.error("❌ Unable to create drug trend chart")
             
-            st.dataframe(styled_df, use_container_width=True)
+            # Enhanced top drugs table
+            if 'drug' in monthly_drug.columns and 'count' in monthly_drug.columns:
+                st.markdown("### 🏆 Top 10 Drugs by Total Reports")
+                top_drugs = load_top_totals(data_version, all_drug, 'drug', selected_year)
+                totals = top_drugs.to_numpy()
+                top_drugs_df = pd.DataFrame({
+                    'Rank': np.arange(1, len(totals) + 1),
+                    'Drug Name': top_drugs.index,
+                    'Total Reports': totals,
+                    'Percentage': totals / totals.sum() * 100
+                })
+                
+                # Color-code the table
+                styled_df = top_drugs_df.style.format({
+                    'Total Reports': '{:,}',
+                    'Percentage': '{:.1f}%'
+                }).apply(gradient_css, cmap='Blues', subset=['Total Reports'])
+                
+                st.dataframe(styled_df, use_container_width=True)
     
     with tab3:
-        st.markdown("### ⚠️ Reaction-Specific Trends")
-        if selected_reaction != "<ALL>":
-            st.markdown(f"*Analyzing reports for: **{selected_reaction}***")
-        else:
-            st.markdown("*Comprehensive reaction analysis across all adverse events*")
-        
-        fig_reaction = create_filtered_trend_chart(monthly_reaction, "reaction", selected_reaction, method=selected_method_key)
-        if fig_reaction:
-            st.plotly_chart(fig_reaction, use_container_width=True)
-        else:
-            st.error("❌ Unable to create reaction trend chart")
-        
-        # Enhanced top reactions table
-        if 'reaction_pt' in monthly_reaction.columns and 'count' in monthly_reaction.columns:
-            st.markdown("### 🏆 Top 10 Reactions by Total Reports")
-            top_reactions = monthly_reaction.groupby('reaction_pt')['count'].sum().sort_values(ascending=False).head(10)
-            top_reactions_df = pd.DataFrame({
-                'Rank': range(1, len(top_reactions) + 1),
-                'Reaction': top_reactions.index,
-                'Total Reports': top_reactions.values,
-                'Percentage': [(count/top_reactions.sum()*100) for count in top_reactions.values]
-            })
+        if tab_is_open(tab3):
+            st.markdown("### ⚠️ Reaction-Specific Trends")
+            if selected_reaction != "<ALL>":
+                st.markdown(f"*Analyzing reports for: **{selected_reaction}***")
+            else:
+                st.markdown("*Comprehensive reaction analysis across all adverse events*")
             
-            # Color-code the table
-            styled_df = top_reactions_df.style.format({
-                'Total Reports': '{:,}',
-                'Percentage': '{:.1f}%'
-            }).background_gradient(subset=['Total Reports'], cmap='Reds')
+            fig_reaction = create_filtered_trend_chart(monthly_reaction, "reaction", selected_reaction, method=selected_method_key)
+            if fig_reaction:
+                st.plotly_chart(fig_reaction, use_container_width=True)
+            else:
+                st.error("❌ Unable to create reaction trend chart")
             
-            st.dataframe(styled_df, use_container_width=True)
+            # Enhanced top reactions table
+            if 'reaction_pt' in monthly_reaction.columns and 'count' in monthly_reaction.columns:
+                st.markdown("### 🏆 Top 10 Reactions by Total Reports")
+                top_reactions = load_top_totals(data_version, all_reaction, 'reaction_pt', selected_year)
+                totals = top_reactions.to_numpy()
+                top_reactions_df = pd.DataFrame({
+                    'Rank': np.arange(1, len(totals) + 1),
+                    'Reaction': top_reactions.index,
+                    'Total Reports': totals,
+                    'Percentage': totals / totals.sum() * 100
+                })
+                
+                # Color-code the table
+                styled_df = top_reactions_df.style.format({
+                    'Total Reports': '{:,}',
+                    'Percentage': '{:.1f}%'
+                }).apply(gradient_css, cmap='Reds', subset=['Total Reports'])
+                
+                st.dataframe(styled_df, use_container_width=True)
     
     with tab4:
-        st.markdown("### 📋 Raw Data Tables")
-        st.markdown("*Explore the underlying data powering the visualizations*")
-        
-        # Sub-tabs for different data types
-        data_tab1, data_tab2, data_tab3 = st.tabs(["Monthly Counts", "Drug Data", "Reaction Data"])
-        
-        with data_tab1:
-            st.markdown("#### 📅 Monthly Overall Counts")
-            if not monthly_counts.empty:
-                st.dataframe(monthly_counts.head(20), use_container_width=True)
-                st.markdown(f"*Showing first 20 of {len(monthly_counts)} total records*")
-            else:
-                st.warning("No monthly counts data available")
-        
-        with data_tab2:
-            st.markdown("#### 💊 Monthly Drug Data")
-            if not monthly_drug.empty:
-                st.dataframe(monthly_drug.head(20), use_container_width=True)
-                st.markdown(f"*Showing first 20 of {len(monthly_drug)} total records*")
-            else:
-                st.warning("No drug data available")
-        
-        with data_tab3:
-            st.markdown("#### ⚠️ Monthly Reaction Data")
-            if not monthly_reaction.empty:
-                st.dataframe(monthly_reaction.head(20), use_container_width=True)
-                st.markdown(f"*Showing first 20 of {len(monthly_reaction)} total records*")
-            else:
-                st.warning("No reaction data available")
+        if tab_is_open(tab4):
+            st.markdown("### 📋 Raw Data Tables")
+            st.markdown("*Explore the underlying data powering the visualizations*")
+            
+            # Sub-tabs for different data types
+            data_tab1, data_tab2, data_tab3 = st.tabs(["Monthly Counts", "Drug Data", "Reaction Data"])
+            
+            with data_tab1:
+                st.markdown("#### 📅 Monthly Overall Counts")
+                if not monthly_counts.empty:
+                    st.dataframe(monthly_counts.head(20), use_container_width=True)
+                    st.markdown(f"*Showing first 20 of {len(monthly_counts)} total records*")
+                else:
+                    st.warning("No monthly counts data available")
+            
+            with data_tab2:
+                st.markdown("#### 💊 Monthly Drug Data")
+                if not monthly_drug.empty:
+                    st.dataframe(monthly_drug.head(20), use_container_width=True)
+                    st.markdown(f"*Showing first 20 of {len(monthly_drug)} total records*")
+                else:
+                    st.warning("No drug data available")
+            
+            with data_tab3:
+                st.markdown("#### ⚠️ Monthly Reaction Data")
+                if not monthly_reaction.empty:
+                    st.dataframe(monthly_reaction.head(20), use_container_width=True)
+                    st.markdown(f"*Showing first 20 of {len(monthly_reaction)} total records*")
+                else:
+                    st.warning("No reaction data available")
     
     # Footer with enhanced styling
     st.markdown("---")
@@ -754,79 +940,14 @@ def main():
     # Data Sources Section
     st.markdown("### 📚 Data Sources")
     
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.markdown(
-            """
-            <div style="background-color: #f0f2f6; padding: 15px; border-radius: 10px; border-left: 4px solid #1f77b4;">
-            <h4 style="color: #1f77b4; margin-top: 0;">🏛️ FDA FAERS</h4>
-            <p><a href="https://fis.fda.gov/extensions/FPD-QDE-FAERS/FPD-QDE-FAERS.html" target="_blank" style="text-decoration: none;">FDA Adverse Event Reporting System (FAERS) Quarterly Data</a></p>
-            <small>Official FDA adverse event reports</small>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-    
-    with col2:
-        st.markdown(
-            """
-            <div style="background-color: #f0f8f0; padding: 15px; border-radius: 10px; border-left: 4px solid #2ca02c;">
-            <h4 style="color: #2ca02c; margin-top: 0;">💊 WebMD Reviews</h4>
-            <p><a href="https://www.kaggle.com/datasets/rohanharode07/webmd-drug-reviews-dataset" target="_blank" style="text-decoration: none;">WebMD Drug Reviews Dataset</a></p>
-            <small>Patient-generated drug reviews</small>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-    
-    with col3:
-        st.markdown(
-            """
-            <div style="background-color: #fff8f0; padding: 15px; border-radius: 10px; border-left: 4px solid #ff7f0e;">
-            <h4 style="color: #ff7f0e; margin-top: 0;">🎓 UCI ML Dataset</h4>
-            <p><a href="https://www.kaggle.com/datasets/jessicali9530/kuc-hackathon-winter-2018" target="_blank" style="text-decoration: none;">UCI ML Drug Review dataset</a></p>
-            <small>Drugs.com review dataset</small>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+    st.markdown(DATA_SOURCES_HTML, unsafe_allow_html=True)
     
     st.markdown("<br>", unsafe_allow_html=True)
     
     # Contact and Attribution Section
     st.markdown("### 👨‍💻 About & Contact")
     
-    contact_col1, contact_col2 = st.columns([2, 1])
-    
-    with contact_col1:
-        st.markdown(
-            """
-            <div style="background-color: #f8f9fa; padding: 20px; border-radius: 10px; border: 1px solid #dee2e6;">
-            <h4 style="color: #495057; margin-top: 0;">📧 Mahin Das</h4>
-            <p style="margin: 5px 0;"><strong>Email:</strong> 
-            <a href="mailto:mahinds04@gmail.com">mahinds04@gmail.com</a> | 
-            <a href="mailto:dasmahin07@gmail.com">dasmahin07@gmail.com</a></p>
-            <p style="margin: 5px 0;"><strong>GitHub:</strong> 
-            <a href="https://github.com/mahinds04" target="_blank">https://github.com/mahinds04</a></p>
-            <p style="margin: 5px 0; color: #6c757d;"><em>Adverse Event Trend Analyzer - Transforming drug safety data into actionable insights</em></p>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
-    
-    with contact_col2:
-        st.markdown(
-            """
-            <div style="text-align: center; padding: 20px;">
-            <h4>⚡ Tech Stack</h4>
-            <p>🐍 Python | 📊 Streamlit</p>
-            <p>📈 Plotly | 🗃️ Pandas</p>
-            <p>🏥 FAERS | 🤖 NLP</p>
-            </div>
-            """,
-            unsafe_allow_html=True
-        )
+    st.markdown(CONTACT_HTML, unsafe_allow_html=True)
     
     st.markdown("---")
     st.markdown(
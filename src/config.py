@@ -17,6 +17,9 @@ PROC_DIR = BASE_DIR / 'data' / 'processed'
 FIG_DIR = BASE_DIR / 'reports' / 'figures'
 REPORTS_DIR = BASE_DIR / 'reports'
 
+# User-level cache for intermediate results that are reused across runs
+CACHE_DIR = Path.home() / '.cache' / 'ae-trend-analyzer'
+
 # Ensure directories exist
 def ensure_directories():
     """Create all necessary directories if they don't exist."""
@@ -95,6 +98,10 @@ ANALYSIS_CONFIG = {
     'top_n_default': 10,  # Default number of top items in analyses
     'plot_dpi': 300,      # Plot resolution
     'plot_figsize': (12, 8),  # Default figure size
+    'aggregation_cache': False,  # Reuse monthly aggregations from CACHE_DIR/aggregations (enabled by the ETL CLI)
+    'aggregation_cache_max_entries': 8,  # Least recently used aggregation sets beyond this are deleted
+    'prophet_model_cache': False,  # Reuse fitted Prophet models from CACHE_DIR/prophet for unchanged series (enabled by the ETL CLI)
+    'prophet_cache_max_models': 64,  # Least recently used models beyond this are deleted
 }
 
 # Adverse event keywords for review processing
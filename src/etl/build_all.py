@@ -33,7 +33,7 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 # Import configuration and modules
 from config import (
     RAW_DIR, PROC_DIR, FIG_DIR, OUTPUT_FILES, PLOT_FILES,
-    REVIEW_CONFIG, LOGGING_CONFIG, ensure_directories
+    REVIEW_CONFIG, LOGGING_CONFIG, ANALYSIS_CONFIG, ensure_directories
 )
 from etl.faers_loader import discover_quarters, load_quarter_data
 from etl.reviews_loader import process_reviews
@@ -109,6 +109,18 @@ Examples:
         help='Number of worker processes for parallel processing (default: 1, future use)'
     )
     
+    parser.add_argument(
+        '--no-aggregation-cache',
+        action='store_true',
+        help='Always recompute monthly aggregations instead of reusing cached results'
+    )
+    
+    parser.add_argument(
+        '--no-prophet-cache',
+        action='store_true',
+        help='Always refit Prophet models instead of reusing cached fits'
+    )
+    
     return parser.parse_args()
 
 def setup_directories(args: argparse.Namespace) -> dict:
@@ -317,6 +329,27 @@ def process_reviews_data(raw_dir: Path, proc_dir: Path) -> pd.DataFrame:
         logger.error(f"Failed to process reviews: {e}")
         return pd.DataFrame()
 
+def save_aggregation(df: pd.DataFrame, output_file: Path) -> None:
+    """
+    Save an aggregation as CSV plus a Parquet sibling.
+    
+    The CSV stays the canonical, human-readable output; the Parquet copy
+    (same stem, ``.parquet`` suffix) is a typed columnar version that readers
+    can load with column projection instead of re-tokenizing the CSV.
+    
+    Args:
+        df: Aggregated DataFrame
+        output_file: CSV output path
+    """
+    output_file = Path(output_file)
+    df.to_csv(output_file, index=False)
+    df.to_parquet(
+        output_file.with_suffix('.parquet'),
+        compression='zstd',
+        use_dictionary=True,
+        index=False
+    )
+
 def create_monthly_aggregations(events_df: pd.DataFrame, proc_dir: Path) -> tuple:
     """
     Create and save monthly aggregation files.
@@ -340,17 +373,17 @@ def create_monthly_aggregations(events_df: pd.DataFrame, proc_dir: Path) -> tupl
     # Save aggregations
     if not monthly_overall_df.empty:
         output_file = proc_dir / OUTPUT_FILES['monthly_counts']
-        monthly_overall_df.to_csv(output_file, index=False)
+        save_aggregation(monthly_overall_df, output_file)
         logger.info(f"Saved monthly overall counts to {output_file}")
     
     if not monthly_reaction_df.empty:
         output_file = proc_dir / OUTPUT_FILES['monthly_by_reaction']
-        monthly_reaction_df.to_csv(output_file, index=False)
+        save_aggregation(monthly_reaction_df, output_file)
         logger.info(f"Saved monthly by reaction counts to {output_file}")
     
     if not monthly_drug_df.empty:
         output_file = proc_dir / OUTPUT_FILES['monthly_by_drug']
-        monthly_drug_df.to_csv(output_file, index=False)
+        save_aggregation(monthly_drug_df, output_file)
         logger.info(f"Saved monthly by drug counts to {output_file}")
     
     # Print aggregation statistics
@@ -469,6 +502,10 @@ def main():
     if args.workers > 1:
         logger.info(f"Worker processes configured: {args.workers} (future feature)")
     
+    # Repeated pipeline runs over unchanged events reuse cached aggregations
+    ANALYSIS_CONFIG['aggregation_cache'] = not args.no_aggregation_cache
+    ANALYSIS_CONFIG['prophet_model_cache'] = not args.no_prophet_cache
+    
     try:
         # Setup directories using CLI arguments or config defaults
         dirs = setup_directories(args)